@@ -14,7 +14,12 @@ from models.user import User
 from models.product import Product, ProductImage
 from models.trip import Trip, TripImage
 from models.event import Event, EventImage
-from models.lost_found import LostFoundItem
+from models.lost_found import LostFoundItem, LostFoundMatch
+from models.donation import Donation, DonationImage
+from models.ride import Ride
+from models.cafe import Cafe, Review
+from models.society import Society, SocietyReview
+from models.feed import FeedItem
 
 # this is the Alembic Config object
 config = context.config
@@ -26,12 +31,27 @@ if config.config_file_name is not None:
 # Set target metadata for autogenerate support
 target_metadata = Base.metadata
 
+# PostgreSQL-only objects created by migrations but not declared on the models:
+# full-text search_vector columns and their GIN indexes, and trigram indexes
+MIGRATION_ONLY_COLUMNS = {"search_vector"}
+MIGRATION_ONLY_INDEX_SUFFIXES = ("_search_vector", "_trgm")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None:
+        if type_ == "column" and name in MIGRATION_ONLY_COLUMNS:
+            return False
+        if type_ == "index" and name.endswith(MIGRATION_ONLY_INDEX_SUFFIXES):
+            return False
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -42,7 +62,8 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
-    from database import DATABASE_URL
+    from database import DATABASE_URL, check_settings
+    check_settings()
     
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = DATABASE_URL
@@ -55,7 +76,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,58 @@
+"""post keyset pagination indexes
+
+Revision ID: 1d9f7a4e2c68
+Revises: e5a8b3c6d902
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d9f7a4e2c68'
+down_revision: Union[str, Sequence[str], None] = 'e5a8b3c6d902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POST_TABLES = [
+    ('products', 'creator_id'),
+    ('trips', 'creator_id'),
+    ('events', 'creator_id'),
+    ('donations', 'creator_id'),
+    ('lost_found_items', 'creator_id'),
+    ('rides', 'requester_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # List endpoints page on (created_at, id); the id tie-breaker is added to the
+    # created_at indexes so the seek and the ORDER BY are both served by the index
+    with op.get_context().autocommit_block():
+        for table, owner in POST_TABLES:
+            op.create_index(
+                f'ix_{table}_{owner}_created_at_id', table,
+                [owner, sa.text('created_at DESC'), sa.text('id DESC')],
+                if_not_exists=True, postgresql_concurrently=True,
+            )
+            op.create_index(
+                f'ix_{table}_created_at_id', table,
+                [sa.text('created_at DESC'), sa.text('id DESC')],
+                if_not_exists=True, postgresql_concurrently=True,
+            )
+            op.drop_index(f'ix_{table}_{owner}_created_at', table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_created_at', table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, owner in POST_TABLES:
+            op.create_index(f'ix_{table}_{owner}_created_at', table, [owner, sa.text('created_at DESC')], postgresql_concurrently=True)
+            op.create_index(f'ix_{table}_created_at', table, [sa.text('created_at DESC')], postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_{owner}_created_at_id', table_name=table, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_created_at_id', table_name=table, postgresql_concurrently=True)
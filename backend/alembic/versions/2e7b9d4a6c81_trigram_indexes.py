@@ -0,0 +1,53 @@
+"""trigram indexes
+
+Revision ID: 2e7b9d4a6c81
+Revises: 9c4f2b7e1d35
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7b9d4a6c81'
+down_revision: Union[str, Sequence[str], None] = '9c4f2b7e1d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Free-text columns served by /autocomplete (PostgreSQL only, like the search vectors)
+TRIGRAM_COLUMNS = [
+    ('rides', 'from_location'),
+    ('rides', 'to_location'),
+    ('products', 'pickup_location'),
+    ('products', 'title'),
+    ('trips', 'title'),
+    ('events', 'title'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Needs CREATE privilege on the database; managed providers allow pg_trgm
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f'ix_{table}_{column}_trgm', table, [column],
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+                if_not_exists=True, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,205 @@
+"""baseline schema
+
+Revision ID: 3f1c2a9b7d10
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9b7d10'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Databases created before migrations existed already have these tables
+# (from Base.metadata.create_all), so each one is only created if missing.
+def _create_table(name, *columns):
+    if sa.inspect(op.get_bind()).has_table(name):
+        return False
+    op.create_table(name, *columns)
+    op.create_index(f"ix_{name}_id", name, ["id"])
+    return True
+
+
+def _timestamps():
+    return [
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('department', sa.String(), nullable=False),
+        sa.Column('password', sa.String(), nullable=False),
+    ):
+        op.create_index('ix_users_username', 'users', ['username'], unique=True)
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    _create_table(
+        'products',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('pickup_location', sa.String(), nullable=False),
+        sa.Column('condition', sa.String(), nullable=False),
+        sa.Column('contact_number', sa.String(), nullable=False),
+        *_timestamps(),
+        sa.Column('creator_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+    )
+    _create_table(
+        'product_images',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('image_path', sa.String(), nullable=False),
+        sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.id', ondelete='CASCADE')),
+    )
+
+    _create_table(
+        'trips',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('destination', sa.String(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('departure_location', sa.String(), nullable=False),
+        sa.Column('max_participants', sa.Integer(), nullable=True),
+        sa.Column('cost_per_person', sa.Float(), nullable=False),
+        sa.Column('contact_number', sa.String(), nullable=False),
+        *_timestamps(),
+        sa.Column('creator_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+    )
+    _create_table(
+        'trip_images',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('image_path', sa.String(), nullable=False),
+        sa.Column('trip_id', sa.Integer(), sa.ForeignKey('trips.id', ondelete='CASCADE')),
+    )
+
+    _create_table(
+        'events',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('society', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.Column('event_date', sa.DateTime(), nullable=False),
+        sa.Column('contact_number', sa.String(), nullable=True),
+        *_timestamps(),
+        sa.Column('creator_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+    )
+    _create_table(
+        'event_images',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('image_path', sa.String(), nullable=False),
+        sa.Column('event_id', sa.Integer(), sa.ForeignKey('events.id', ondelete='CASCADE')),
+    )
+
+    _create_table(
+        'donations',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('beneficiary', sa.String(), nullable=False),
+        sa.Column('goal_amount', sa.Float(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('contact_number', sa.String(), nullable=True),
+        *_timestamps(),
+        sa.Column('creator_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+    )
+    _create_table(
+        'donation_images',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('image_path', sa.String(), nullable=False),
+        sa.Column('donation_id', sa.Integer(), sa.ForeignKey('donations.id', ondelete='CASCADE')),
+    )
+
+    _create_table(
+        'lost_found_items',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('location', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('image_path', sa.String(), nullable=True),
+        sa.Column('contact_method', sa.Enum('phone', 'email', 'whatsapp', name='contactmethod'), nullable=False),
+        sa.Column('contact_info', sa.String(), nullable=False),
+        sa.Column('type', sa.Enum('lost', 'found', name='itemtype'), nullable=False),
+        sa.Column('status', sa.Enum('LOST', 'FOUND', 'CLAIMED', name='itemstatus'), nullable=False),
+        *_timestamps(),
+        sa.Column('creator_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+    )
+
+    if _create_table(
+        'rides',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('from_location', sa.String(), nullable=False),
+        sa.Column('to_location', sa.String(), nullable=False),
+        sa.Column('ride_date', sa.String(), nullable=False),
+        sa.Column('ride_time', sa.String(), nullable=False),
+        sa.Column('contact', sa.String(), nullable=False),
+        sa.Column('requester_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+        *_timestamps(),
+    ):
+        op.create_index('ix_rides_from_location', 'rides', ['from_location'])
+        op.create_index('ix_rides_to_location', 'rides', ['to_location'])
+        op.create_index('ix_rides_ride_date', 'rides', ['ride_date'])
+
+    _create_table(
+        'cafes',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+    )
+    _create_table(
+        'reviews',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('cafe_id', sa.Integer(), sa.ForeignKey('cafes.id'), nullable=False),
+    )
+
+    _create_table(
+        'societies',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('instagram_url', sa.String(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+    )
+    _create_table(
+        'society_reviews',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE')),
+        sa.Column('society_id', sa.Integer(), sa.ForeignKey('societies.id', ondelete='CASCADE')),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in [
+        'society_reviews', 'societies', 'reviews', 'cafes', 'rides', 'lost_found_items',
+        'donation_images', 'donations', 'event_images', 'events', 'trip_images', 'trips',
+        'product_images', 'products', 'users',
+    ]:
+        op.drop_table(name)
+    for enum_name in ['contactmethod', 'itemtype', 'itemstatus']:
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
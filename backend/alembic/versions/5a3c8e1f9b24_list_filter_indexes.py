@@ -0,0 +1,47 @@
+"""list filter indexes
+
+Revision ID: 5a3c8e1f9b24
+Revises: 1d9f7a4e2c68
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3c8e1f9b24'
+down_revision: Union[str, Sequence[str], None] = '1d9f7a4e2c68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Equality filters lead and keep the list's (created_at, id) order, so a filtered
+# page is still a single index range scan; range filters get a plain index
+INDEXES = [
+    ('ix_products_category_created_at_id', 'products', ['category', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_products_condition_created_at_id', 'products', ['condition', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_products_price', 'products', ['price']),
+    ('ix_lost_found_items_category_created_at_id', 'lost_found_items', ['category', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_lost_found_items_type_status_created_at_id', 'lost_found_items', ['type', 'status', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_lost_found_items_date', 'lost_found_items', ['date']),
+    ('ix_trips_start_date', 'trips', ['start_date']),
+    ('ix_events_society_event_date', 'events', ['society', 'event_date']),
+    ('ix_events_event_date', 'events', ['event_date']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,84 @@
+"""ride departure_at
+
+Revision ID: 6f1a3d8c5e27
+Revises: 2e7b9d4a6c81
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1a3d8c5e27'
+down_revision: Union[str, Sequence[str], None] = '2e7b9d4a6c81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same rules as routers.ride.parse_departure, frozen here for the backfill
+RIDE_TIMEZONE = ZoneInfo(os.getenv("RIDE_TIMEZONE", "Asia/Karachi"))
+RIDE_TIME_FORMATS = ["%H:%M", "%H:%M:%S", "%I:%M %p"]
+BATCH_SIZE = 1000
+
+
+def _departure(ride_date, ride_time):
+    for time_format in RIDE_TIME_FORMATS:
+        try:
+            local = datetime.strptime(f"{ride_date.strip()[:10]} {ride_time.strip()}", f"%Y-%m-%d {time_format}")
+        except ValueError:
+            continue
+        return local.replace(tzinfo=RIDE_TIMEZONE).astimezone(timezone.utc)
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    # Databases set up by create_all may already have the column
+    if 'departure_at' not in {column['name'] for column in sa.inspect(connection).get_columns('rides')}:
+        op.add_column('rides', sa.Column('departure_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill in id order, a batch at a time; rides whose strings don't parse stay NULL
+    rides = sa.table('rides', sa.column('id', sa.Integer), sa.column('ride_date', sa.String),
+                     sa.column('ride_time', sa.String), sa.column('departure_at', sa.DateTime(timezone=True)))
+    last_id = 0
+    while True:
+        batch = connection.execute(
+            sa.select(rides.c.id, rides.c.ride_date, rides.c.ride_time)
+            .where(rides.c.id > last_id)
+            .order_by(rides.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        updates = [
+            {'ride_id': ride_id, 'departure_at': departure}
+            for ride_id, ride_date, ride_time in batch
+            if (departure := _departure(ride_date, ride_time)) is not None
+        ]
+        if updates:
+            connection.execute(
+                rides.update().where(rides.c.id == sa.bindparam('ride_id')).values(departure_at=sa.bindparam('departure_at')),
+                updates,
+            )
+        last_id = batch[-1].id
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_rides_from_location_to_location_departure_at', 'rides',
+            ['from_location', 'to_location', 'departure_at'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_rides_from_location_to_location_departure_at', table_name='rides', if_exists=True, postgresql_concurrently=True)
+    op.drop_column('rides', 'departure_at')
@@ -0,0 +1,37 @@
+"""trip destination index
+
+Revision ID: 7c3e5b9a1f48
+Revises: f2c5a8d1e476
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5b9a1f48'
+down_revision: Union[str, Sequence[str], None] = 'f2c5a8d1e476'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# GET /trips/?destination= is an equality filter; like the other list filters it
+# leads and keeps the (created_at, id) order, so a filtered page is one range scan
+INDEX = ('ix_trips_destination_created_at_id', 'trips', ['destination', sa.text('created_at DESC'), sa.text('id DESC')])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    name, table, columns = INDEX
+    with op.get_context().autocommit_block():
+        op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    name, table, _ = INDEX
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
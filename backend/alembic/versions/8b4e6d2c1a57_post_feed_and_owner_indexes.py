@@ -0,0 +1,60 @@
+"""post feed and owner indexes
+
+Revision ID: 8b4e6d2c1a57
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6d2c1a57'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9b7d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, owner column) for every post table shown on the dashboard and "/me" pages
+POST_TABLES = [
+    ('products', 'creator_id'),
+    ('trips', 'creator_id'),
+    ('events', 'creator_id'),
+    ('donations', 'creator_id'),
+    ('lost_found_items', 'creator_id'),
+    ('rides', 'requester_id'),
+]
+
+# (image table, foreign key to its post)
+IMAGE_TABLES = [
+    ('product_images', 'product_id'),
+    ('trip_images', 'trip_id'),
+    ('event_images', 'event_id'),
+    ('donation_images', 'donation_id'),
+]
+
+
+def _indexes():
+    for table, owner in POST_TABLES:
+        yield f'ix_{table}_{owner}_created_at', table, [owner, sa.text('created_at DESC')]
+        yield f'ix_{table}_created_at', table, [sa.text('created_at DESC')]
+    for table, foreign_key in IMAGE_TABLES:
+        yield f'ix_{table}_{foreign_key}', table, [foreign_key]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but avoids locking the tables for writes
+    with op.get_context().autocommit_block():
+        for name, table, columns in _indexes():
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in _indexes():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
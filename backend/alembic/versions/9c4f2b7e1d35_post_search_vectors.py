@@ -0,0 +1,57 @@
+"""post search vectors
+
+Revision ID: 9c4f2b7e1d35
+Revises: 5a3c8e1f9b24
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f2b7e1d35'
+down_revision: Union[str, Sequence[str], None] = '5a3c8e1f9b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables searched by /search; the column is left out of the models because it
+# only exists on PostgreSQL
+SEARCH_TABLES = ['products', 'trips', 'events', 'donations', 'lost_found_items']
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Adding a stored generated column rewrites the table, so this part takes a lock
+    for table in SEARCH_TABLES:
+        op.execute(
+            f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector '
+            f'GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED'
+        )
+    with op.get_context().autocommit_block():
+        for table in SEARCH_TABLES:
+            op.create_index(
+                f'ix_{table}_search_vector', table, ['search_vector'],
+                postgresql_using='gin', if_not_exists=True, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for table in SEARCH_TABLES:
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, if_exists=True, postgresql_concurrently=True)
+    for table in SEARCH_TABLES:
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,45 @@
+"""lost_found_matches
+
+Revision ID: a3e6c9f2b814
+Revises: 6f1a3d8c5e27
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e6c9f2b814'
+down_revision: Union[str, Sequence[str], None] = '6f1a3d8c5e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('lost_found_matches'):
+        op.create_table(
+            'lost_found_matches',
+            sa.Column('lost_item_id', sa.Integer(), sa.ForeignKey('lost_found_items.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('found_item_id', sa.Integer(), sa.ForeignKey('lost_found_items.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('score', sa.Float(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_lost_found_matches_found_item_id', 'lost_found_matches', ['found_item_id'])
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_lost_found_items_type_category_date', 'lost_found_items', ['type', 'category', 'date'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+    # Existing items are matched with ``python matching.py rebuild``
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_lost_found_items_type_category_date', table_name='lost_found_items', if_exists=True, postgresql_concurrently=True)
+    op.drop_table('lost_found_matches')
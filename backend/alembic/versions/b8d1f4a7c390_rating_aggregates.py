@@ -0,0 +1,52 @@
+"""rating aggregates
+
+Revision ID: b8d1f4a7c390
+Revises: a3e6c9f2b814
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d1f4a7c390'
+down_revision: Union[str, Sequence[str], None] = 'a3e6c9f2b814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (rated table, review table, review column pointing at it)
+RATED_TABLES = [
+    ('cafes', 'reviews', 'cafe_id'),
+    ('societies', 'society_reviews', 'society_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    for table, review_table, foreign_key in RATED_TABLES:
+        # Databases set up by create_all may already have the columns
+        existing = {column['name'] for column in sa.inspect(connection).get_columns(table)}
+        if 'rating_sum' not in existing:
+            op.add_column(table, sa.Column('rating_sum', sa.Float(), nullable=False, server_default='0'))
+        if 'review_count' not in existing:
+            op.add_column(table, sa.Column('review_count', sa.Integer(), nullable=False, server_default='0'))
+
+        # Backfill from the reviews
+        op.execute(
+            f'UPDATE {table} SET '
+            f'rating_sum = (SELECT coalesce(sum(rating), 0) FROM {review_table} WHERE {foreign_key} = {table}.id), '
+            f'review_count = (SELECT count(*) FROM {review_table} WHERE {foreign_key} = {table}.id)'
+        )
+    op.execute('UPDATE cafes SET rating = (SELECT avg(rating) FROM reviews WHERE cafe_id = cafes.id)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, _ in RATED_TABLES:
+        op.drop_column(table, 'review_count')
+        op.drop_column(table, 'rating_sum')
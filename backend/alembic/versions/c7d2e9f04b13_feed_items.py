@@ -0,0 +1,69 @@
+"""feed_items
+
+Revision ID: c7d2e9f04b13
+Revises: 8b4e6d2c1a57
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9f04b13'
+down_revision: Union[str, Sequence[str], None] = '8b4e6d2c1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The card projections of feed.py as they were at this revision, frozen here for
+# the backfill so later changes to the models or card queries can't change it
+def _first_image(images, parent_id):
+    return f"(SELECT image_path FROM {images} WHERE {parent_id} = p.id ORDER BY id LIMIT 1)"
+
+
+CARDS = {
+    # type: (table, owner column, title, subtitle, price, image)
+    'product': ('products', 'creator_id', 'p.title', 'p.category', 'p.price', _first_image('product_images', 'product_id')),
+    'trip': ('trips', 'creator_id', 'p.title', 'p.destination', 'p.cost_per_person', _first_image('trip_images', 'trip_id')),
+    'event': ('events', 'creator_id', 'p.title', 'p.location', 'NULL', _first_image('event_images', 'event_id')),
+    'ride': ('rides', 'requester_id', "p.from_location || ' to ' || p.to_location", "p.ride_date || ' at ' || p.ride_time", 'NULL', 'NULL'),
+    'donation': ('donations', 'creator_id', 'p.title', 'p.beneficiary', 'p.goal_amount', _first_image('donation_images', 'donation_id')),
+    'lost_found': ('lost_found_items', 'creator_id', 'p.title', 'p.location', 'NULL', 'p.image_path'),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('feed_items'):
+        op.create_table(
+            'feed_items',
+            sa.Column('type', sa.String(), primary_key=True),
+            sa.Column('entity_id', sa.Integer(), primary_key=True),
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('subtitle', sa.String(), nullable=True),
+            sa.Column('price', sa.Float(), nullable=True),
+            sa.Column('image', sa.String(), nullable=True),
+            sa.Column('creator_id', sa.Integer(), nullable=True),
+            sa.Column('creator_username', sa.String(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_feed_items_creator_id', 'feed_items', ['creator_id'])
+        op.create_index('ix_feed_items_created_at', 'feed_items', [sa.text('created_at DESC')])
+
+    # Backfill from the existing posts
+    op.execute('DELETE FROM feed_items')
+    for type_, (table, owner, title, subtitle, price, image) in CARDS.items():
+        op.execute(
+            'INSERT INTO feed_items (type, entity_id, title, subtitle, price, image, creator_id, creator_username, created_at) '
+            f"SELECT '{type_}', p.id, {title}, {subtitle}, CAST({price} AS FLOAT), CAST({image} AS VARCHAR), "
+            f'p.{owner}, u.username, p.created_at '
+            f'FROM {table} p JOIN users u ON u.id = p.{owner}'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('feed_items')
@@ -0,0 +1,56 @@
+"""review created_at and page indexes
+
+Revision ID: d4b7e2a9c615
+Revises: b8d1f4a7c390
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7e2a9c615'
+down_revision: Union[str, Sequence[str], None] = 'b8d1f4a7c390'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (review table, column pointing at the reviewed cafe/society)
+REVIEW_TABLES = [
+    ('reviews', 'cafe_id'),
+    ('society_reviews', 'society_id'),
+]
+
+
+def _indexes():
+    for table, parent in REVIEW_TABLES:
+        yield f'ix_{table}_{parent}_created_at_id', table, [parent, sa.text('created_at DESC'), sa.text('id DESC')]
+        yield f'ix_{table}_{parent}_rating_id', table, [parent, sa.text('rating DESC'), sa.text('id DESC')]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    for table, _ in REVIEW_TABLES:
+        # Databases set up by create_all may already have the column
+        if 'created_at' not in {column['name'] for column in sa.inspect(connection).get_columns(table)}:
+            op.add_column(table, sa.Column('created_at', sa.DateTime(), nullable=True))
+        # Existing reviews have no known date; give them the migration time so
+        # (created_at, id) cursors never compare against NULL
+        op.execute(f'UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL')
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in _indexes():
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in _indexes():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    for table, _ in REVIEW_TABLES:
+        op.drop_column(table, 'created_at')
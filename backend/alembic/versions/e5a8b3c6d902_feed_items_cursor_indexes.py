@@ -0,0 +1,44 @@
+"""feed_items cursor indexes
+
+Revision ID: e5a8b3c6d902
+Revises: c7d2e9f04b13
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8b3c6d902'
+down_revision: Union[str, Sequence[str], None] = 'c7d2e9f04b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The dashboard pages on (created_at, type, entity_id) and can filter by type.
+    # Built concurrently: every post write also writes feed_items
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_feed_items_created_at_type_entity_id', 'feed_items',
+            [sa.text('created_at DESC'), sa.text('type DESC'), sa.text('entity_id DESC')],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_feed_items_type_created_at_entity_id', 'feed_items',
+            ['type', sa.text('created_at DESC'), sa.text('entity_id DESC')],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+        op.drop_index('ix_feed_items_created_at', table_name='feed_items', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_feed_items_created_at', 'feed_items', [sa.text('created_at DESC')], postgresql_concurrently=True)
+        op.drop_index('ix_feed_items_type_created_at_entity_id', table_name='feed_items', postgresql_concurrently=True)
+        op.drop_index('ix_feed_items_created_at_type_entity_id', table_name='feed_items', postgresql_concurrently=True)
@@ -0,0 +1,56 @@
+"""unique review per user
+
+Revision ID: f2c5a8d1e476
+Revises: d4b7e2a9c615
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c5a8d1e476'
+down_revision: Union[str, Sequence[str], None] = 'd4b7e2a9c615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (review table, column pointing at the reviewed row, reviewed table)
+REVIEW_TABLES = [
+    ('reviews', 'cafe_id', 'cafes'),
+    ('society_reviews', 'society_id', 'societies'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, parent, parent_table in REVIEW_TABLES:
+        # Keep each user's latest review of a cafe/society and drop the older duplicates
+        op.execute(
+            f'DELETE FROM {table} WHERE user_id IS NOT NULL AND {parent} IS NOT NULL '
+            f'AND id NOT IN (SELECT max(id) FROM {table} GROUP BY user_id, {parent})'
+        )
+        # The dropped reviews were counted in the running aggregates
+        op.execute(
+            f'UPDATE {parent_table} SET '
+            f'rating_sum = (SELECT coalesce(sum(rating), 0) FROM {table} WHERE {parent} = {parent_table}.id), '
+            f'review_count = (SELECT count(*) FROM {table} WHERE {parent} = {parent_table}.id)'
+        )
+    op.execute('UPDATE cafes SET rating = (SELECT avg(rating) FROM reviews WHERE cafe_id = cafes.id)')
+
+    with op.get_context().autocommit_block():
+        for table, parent, _ in REVIEW_TABLES:
+            op.create_index(
+                f'uq_{table}_user_id_{parent}', table, ['user_id', parent], unique=True,
+                if_not_exists=True, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, parent, _ in REVIEW_TABLES:
+            op.drop_index(f'uq_{table}_user_id_{parent}', table_name=table, if_exists=True, postgresql_concurrently=True)
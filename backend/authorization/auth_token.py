@@ -2,22 +2,64 @@ from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from schemas.token import TokenData
 from dotenv import load_dotenv
+from cache import TTLCache
+from pathlib import Path
+import hashlib
 import os
-import random
-import string
+import secrets
+import tempfile
+import time
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Where the signing key is kept when SECRET_KEY isn't set
+SECRET_KEY_FILE = Path(os.getenv("SECRET_KEY_FILE") or Path(__file__).resolve().parent.parent / ".secret_key")
+
+
+def load_secret_key() -> str:
+    """SECRET_KEY from the environment, else the key in SECRET_KEY_FILE, generated
+    by whichever process gets there first. The file is written in full under a
+    temporary name and hard linked into place, which fails if it already exists,
+    so processes racing at startup all end up signing with the same key."""
+    key = os.getenv("SECRET_KEY")
+    if key:
+        return key
+    if not SECRET_KEY_FILE.exists():
+        fd, tmp_path = tempfile.mkstemp(dir=SECRET_KEY_FILE.parent, prefix=".secret_key.")  # Created 0600
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_urlsafe(32))
+            try:
+                os.link(tmp_path, SECRET_KEY_FILE)
+            except FileExistsError:
+                pass  # Another process won the race; use its key
+        finally:
+            os.unlink(tmp_path)
+    return SECRET_KEY_FILE.read_text().strip()
+
+
+_secret_key = None
+
+def get_secret_key() -> str:
+    # Loaded on first use rather than at import, which may have to create the key file
+    global _secret_key
+    if _secret_key is None:
+        _secret_key = load_secret_key()
+    return _secret_key
+
+
 # Load constants from .env
-SECRET_KEY = os.getenv("SECRET_KEY") or ''.join(random.choices(string.ascii_letters + string.digits, k=32))  # Generate if not set
 ALGORITHM = os.getenv("ALGORITHM", "HS256")  # Default to HS256 if not set
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))  # Default 7 days
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))  # Default 7 days
 
-# Save the SECRET_KEY if it's generated to .env (optional)
-if not os.getenv("SECRET_KEY"):
-    with open(".env", "a") as f:
-        f.write(f"\nSECRET_KEY={SECRET_KEY}")
+# Verified tokens, keyed by a digest so the cache never holds usable credentials;
+# each entry expires together with its token
+token_cache = TTLCache(
+    "tokens",
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
 
 # Function to create an access token
 def create_access_token(data: dict):
@@ -26,17 +68,25 @@ def create_access_token(data: dict):
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_secret_key(), algorithm=ALGORITHM)
     return encoded_jwt
 
 # Function to verify a token
 def verify_token(token: str, credentials_exception):
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    token_data = token_cache.get(key)
+    if token_data is not None:
+        return token_data
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, get_secret_key(), algorithms=[ALGORITHM])
         email = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
+        # Only valid tokens are cached
+        expires_at = payload.get("exp")
+        token_cache.set(key, token_data, ttl=None if expires_at is None else expires_at - time.time())
         return token_data
     except JWTError as e:
         print(f"DEBUG: JWTError occurred: {str(e)}")
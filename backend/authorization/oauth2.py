@@ -1,12 +1,44 @@
 from fastapi.security import OAuth2PasswordBearer
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
 import database
 from authorization.auth_token import verify_token  # Correct import for auth_token
+from cache import TTLCache
 from models.user import User 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Column values of recently authenticated users, keyed by token subject (email).
+# Per process: another worker's cached copy of an edited user lives up to the TTL.
+user_cache = TTLCache(
+    "users",
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+)
+
+
+def remember_user(user: User):
+    user_cache.set(user.email, {column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+
+def forget_user(email: str):
+    """Drop a user's cached identity; call after changing the user"""
+    user_cache.invalidate(email)
+
+
+def cached_user(email: str):
+    # A detached copy of the cached user; merging it with load=False attaches it
+    # to the request's session without a SELECT
+    values = user_cache.get(email)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
 def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Session = Depends(database.get_db)
@@ -20,10 +52,41 @@ def get_current_user(
     # Verify token and retrieve token data
     token_data = verify_token(token, credentials_exception)
 
+    user = cached_user(token_data.email)
+    if user is not None:
+        return db.merge(user, load=False)
+
     # Fetch the user from the database
     user = db.query(User).filter(User.email == token_data.email).first()
 
     if user is None:
         raise credentials_exception
 
+    remember_user(user)
+    return user
+
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    token_data = verify_token(token, credentials_exception)
+
+    user = cached_user(token_data.email)
+    if user is not None:
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).where(User.email == token_data.email))
+    user = result.scalars().first()
+
+    if user is None:
+        raise credentials_exception
+
+    remember_user(user)
     return user
@@ -0,0 +1,169 @@
+"""In-process router benchmark: latency and SQL statements per request for the read endpoints.
+
+    python benchmarks/endpoints.py [--database-url sqlite://] [--rows 500] [--requests 200] [--only /cafes]
+
+Requests go through the whole ASGI app (middleware, dependencies, response
+models) with no server or network in between. The database is seeded with
+--rows posts of each type. By default it is an in-memory SQLite one, so
+nothing needs to be running; pass a local Postgres URL (an empty database,
+migrated with `alembic upgrade head`) to measure the real query plans,
+full-text search and trigram autocomplete included.
+
+Query budgets are enforced, so a route that goes over its budget fails the run.
+"""
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+ENDPOINTS = [
+    "/dashboard/latest",
+    "/products/",
+    "/products/?category=books&max_price=500",
+    "/products/facets",
+    "/products/1",
+    "/trips/",
+    "/events/",
+    "/donations/",
+    "/rides/",
+    "/rides/match?from_location=H-12&to_location=Saddar&departure_at=2026-03-01T09:00",
+    "/lost-found/",
+    "/lost-found/facets",
+    "/lost-found/1/matches",
+    "/cafes/top",
+    "/cafes/1",
+    "/cafes/1/reviews?sort=rating",
+    "/societies/top",
+    "/societies/1/reviews",
+    "/search/?q=lamp",
+    "/autocomplete/?q=sad",
+    "/users/me",
+    "/users/me/profile/",
+]
+
+
+def seed(rows: int):
+    """Users, posts of every type, cafes and societies with reviews"""
+    from database import SessionLocal, get_engine
+    from hashing import Hash
+    from matching import rebuild_matches
+    from models.user import User
+    from models.product import Product
+    from models.trip import Trip
+    from models.event import Event
+    from models.donation import Donation
+    from models.ride import Ride
+    from models.lost_found import LostFoundItem, ItemType, ItemStatus, ContactMethod
+    from models.cafe import Cafe, Review
+    from models.society import Society, SocietyReview
+    from ratings import reconcile_ratings
+
+    password = Hash.bcrypt("benchmark", rounds=4)
+    categories = ["books", "electronics", "furniture", "clothing"]
+    places = ["H-12", "Saddar", "F-6 Markaz", "Blue Area", "G-9"]
+    start = datetime(2026, 1, 1)
+
+    with SessionLocal() as db:
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", department="SEECS", password=password)
+            for i in range(max(10, rows // 10))
+        ]
+        db.add_all(users)
+        db.flush()
+
+        for i in range(rows):
+            creator = users[i % len(users)]
+            created_at = start + timedelta(minutes=i)
+            place = places[i % len(places)]
+            db.add_all([
+                Product(title=f"Desk lamp {i}", description=f"Barely used lamp number {i}", price=100 + i % 900,
+                        category=categories[i % len(categories)], pickup_location=place, condition="used",
+                        contact_number="03000000000", creator_id=creator.id, created_at=created_at),
+                Trip(title=f"Trip to Naran {i}", description="Three days in the north", destination="Naran",
+                     start_date=date(2026, 6, 1) + timedelta(days=i % 60), end_date=date(2026, 6, 4) + timedelta(days=i % 60),
+                     departure_location=place, cost_per_person=5000 + i, contact_number="03000000000",
+                     creator_id=creator.id, created_at=created_at),
+                Event(title=f"Society meetup {i}", description="Open to all students", society=f"Society {i % 20}",
+                      location=place, event_date=start + timedelta(days=i % 90), creator_id=creator.id, created_at=created_at),
+                Donation(title=f"Fundraiser {i}", description="Books for the library", beneficiary="Library",
+                         goal_amount=10000, end_date=date(2026, 12, 31), creator_id=creator.id, created_at=created_at),
+                Ride(from_location=place, to_location="Saddar" if place != "Saddar" else "H-12",
+                     ride_date="2026-03-01", ride_time="09:00", departure_at=datetime(2026, 3, 1, 4) + timedelta(minutes=i % 240),
+                     contact="03000000000", requester_id=creator.id, created_at=created_at),
+                LostFoundItem(title=f"Black wallet {i}", category=categories[i % len(categories)], location=place,
+                              date=date(2026, 2, 1) + timedelta(days=i % 30), description="Leather wallet with cards", image_path="lost_found/wallet.jpg",
+                              contact_method=ContactMethod.email, contact_info="owner@example.com",
+                              type=ItemType.lost if i % 2 else ItemType.found,
+                              status=ItemStatus.LOST if i % 2 else ItemStatus.FOUND,
+                              creator_id=creator.id, created_at=created_at),
+            ])
+
+        cafes = [Cafe(name=f"Cafe {i}") for i in range(20)]
+        societies = [Society(name=f"Society {i}") for i in range(20)]
+        db.add_all(cafes + societies)
+        db.flush()
+        for i, user in enumerate(users):
+            for j in range(5):
+                cafe, society = cafes[(i + j) % len(cafes)], societies[(i + j) % len(societies)]
+                db.add(Review(rating=1 + (i + j) % 5, comment="Good chai", user_id=user.id, cafe_id=cafe.id))
+                db.add(SocietyReview(rating=1 + (i * j) % 5, comment="Great events", user_id=user.id, society_id=society.id))
+        db.commit()
+        rebuild_matches(db)
+
+    with get_engine().begin() as connection:
+        reconcile_ratings(connection)
+
+
+def measure(client, path: str, headers: dict, requests: int) -> dict:
+    client.get(path, headers=headers)  # Warm caches and lazy imports
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+    samples.sort()
+    return {
+        "median": statistics.median(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1],
+        "queries": response.headers.get("x-query-count", "-"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite://"))
+    parser.add_argument("--rows", type=int, default=500, help="posts of each type to seed")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per endpoint")
+    parser.add_argument("--only", help="only endpoints starting with this path")
+    args = parser.parse_args()
+
+    # Settings are read at import, so they go in before the app is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_CREATE_SCHEMA"] = "true"
+    os.environ["QUERY_BUDGET_MODE"] = "enforce"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+    from fastapi.testclient import TestClient
+    from authorization.auth_token import create_access_token
+    from main import app
+
+    with TestClient(app) as client:  # Runs the lifespan, which creates the schema
+        started = time.perf_counter()
+        seed(args.rows)
+        print(f"seeded {args.rows} rows per post type in {time.perf_counter() - started:.1f} s\n")
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'user1@example.com'})}"}
+        print(f"{'endpoint':<84} {'median':>9} {'p95':>9} {'queries':>8}")
+        for path in ENDPOINTS:
+            if args.only and not path.startswith(args.only):
+                continue
+            result = measure(client, path, headers, args.requests)
+            print(f"{path:<84} {result['median']:7.2f}ms {result['p95']:7.2f}ms {result['queries']:>8}")
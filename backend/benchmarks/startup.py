@@ -0,0 +1,89 @@
+"""Startup benchmark: time to import the app, and from process start to first response.
+
+    python benchmarks/startup.py [--runs 5] [--import-budget-ms 2000] [--first-response-budget-ms 4000]
+
+Each run uses a fresh interpreter with no database settings, as a cold worker
+or a tool importing the app would see it. Exits non-zero when the median of
+either measurement is over its budget, so it can gate CI.
+"""
+from pathlib import Path
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+IMPORT_APP = """
+import time
+start = time.perf_counter()
+import main
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def environment() -> dict:
+    env = {k: v for k, v in os.environ.items() if k not in ("user", "password", "host", "port", "dbname")}
+    env.setdefault("SECRET_KEY", "benchmark-secret")  # Don't create a key file
+    env.setdefault("BCRYPT_ROUNDS", "12")
+    return env
+
+
+def import_ms() -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_APP], cwd=BACKEND, env=environment(), capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def first_response_ms(timeout: float = 30.0) -> float:
+    """Process start to the first 200 from an endpoint that doesn't need the database"""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND, env=environment(),
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health/caches", timeout=1).status_code == 200:
+                    return (time.perf_counter() - start) * 1000
+            except httpx.TransportError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}")
+            time.sleep(0.01)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=2000)
+    parser.add_argument("--first-response-budget-ms", type=float, default=4000)
+    args = parser.parse_args()
+
+    over_budget = False
+    for name, measure, budget in (
+        ("import", import_ms, args.import_budget_ms),
+        ("first response", first_response_ms, args.first_response_budget_ms),
+    ):
+        samples = [measure() for _ in range(args.runs)]
+        median = statistics.median(samples)
+        verdict = "ok" if median <= budget else "OVER BUDGET"
+        over_budget |= median > budget
+        print(f"{name:>14}: median {median:8.1f} ms, best {min(samples):8.1f} ms, budget {budget:.0f} ms  {verdict}")
+    sys.exit(1 if over_budget else 0)
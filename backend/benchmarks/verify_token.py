@@ -0,0 +1,50 @@
+"""Micro-benchmark: cost of authorization.auth_token.verify_token with and without its cache.
+
+    python benchmarks/verify_token.py [--tokens 1000] [--rounds 20]
+
+Cold runs clear the cache before every call, so each one pays for the full
+jwt.decode (HMAC check and claims parsing); warm runs verify the same pool of
+tokens repeatedly, as authenticated traffic does between logins.
+"""
+from pathlib import Path
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "10080")
+
+from authorization.auth_token import create_access_token, verify_token, token_cache  # noqa: E402
+
+
+def run(tokens, rounds: int, cold: bool) -> list:
+    """Microseconds per verify_token call, one sample per round"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for token in tokens:
+            if cold:
+                token_cache.clear()
+            verify_token(token, Exception("invalid token"))
+        samples.append((time.perf_counter() - start) / len(tokens) * 1e6)
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000, help="distinct tokens in the pool")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": f"user{i}@example.com"}) for i in range(args.tokens)]
+    cold = run(tokens, args.rounds, cold=True)
+    token_cache.clear()
+    run(tokens, 1, cold=False)  # fill the cache
+    warm = run(tokens, args.rounds, cold=False)
+
+    for name, samples in (("no cache", cold), ("cached", warm)):
+        print(f"{name:>9}: median {statistics.median(samples):8.2f} us/call, best {min(samples):8.2f} us/call")
+    print(f"  speedup: {statistics.median(cold) / statistics.median(warm):.1f}x")
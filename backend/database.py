@@ -1,9 +1,17 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool  # Required for Supabase Session/Transaction Pooler
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool, StaticPool  # NullPool is required for Supabase's Transaction Pooler
 from pathlib import Path
 from dotenv import load_dotenv
+from fastapi import Request
+from itertools import count
+from threading import Lock
+import asyncio
+import hashlib
 import os
+import time
 
 ENV_PATH = Path(__file__).resolve().parent / ".env"
 if ENV_PATH.exists():
@@ -15,22 +23,404 @@ HOST = os.getenv("host")
 PORT = os.getenv("port")
 DBNAME = os.getenv("dbname")
 
-if not all([USER, PASSWORD, HOST, PORT, DBNAME]):
+
+def check_settings():
+    # Called when the first engine is created, so tooling can import the app without them
+    if os.getenv("DATABASE_URL"):
+        return
     missing = [k for k, v in {
-        "user": USER, 
-        "password": PASSWORD, 
-        "host": HOST, 
-        "port": PORT, 
+        "user": USER,
+        "password": PASSWORD,
+        "host": HOST,
+        "port": PORT,
         "dbname": DBNAME
     }.items() if not v]
-    raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+    if missing:
+        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+
+
+# In-memory SQLite is opened as one named, shared-cache database so the sync and
+# async engines (and every connection of each) see the same tables
+MEMORY_SQLITE_URL = "sqlite:///file:nustmarkaz?mode=memory&cache=shared&uri=true"
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_memory_sqlite(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and (url.database in (None, "", ":memory:") or url.query.get("mode") == "memory")
+
+
+def _async_url(url: str) -> str:
+    # Same database through the async driver. Postgres URLs are given in psycopg2
+    # form; asyncpg spells sslmode as ssl
+    if is_sqlite(url):
+        # Swap the driver textually; re-rendering would escape "file:" URIs
+        return "sqlite+aiosqlite" + url[url.index("://"):]
+    url = make_url(url)
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+
+# Any SQLAlchemy URL: a local Postgres, sqlite:///path/to/file.db, or sqlite://
+# (in memory) for tests and benchmarks. By default, the Supabase database
+# described by user/password/host/port/dbname.
+# Only a given URL is parsed here: the default one isn't valid until check_settings
+# passes, and importing this module must work without any settings.
+if os.getenv("DATABASE_URL"):
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    if is_memory_sqlite(DATABASE_URL):
+        DATABASE_URL = MEMORY_SQLITE_URL
+    _default_async_url = _async_url(DATABASE_URL)
+else:
+    DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
+    _default_async_url = f"postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?ssl=require"
+# Used by the async routers; the same database unless set
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _default_async_url
+
+# Connection pool settings
+# "null"  -> NullPool, a fresh connection per session. Use this behind a transaction
+#            pooler (e.g. Supabase on port 6543) which already pools server-side.
+# "queue" -> client-side QueuePool that keeps warm connections between requests,
+#            for direct connections or session-mode poolers.
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "null").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+
+# Optional read replicas (comma separated psycopg2 URLs) used by get_read_db
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_RETRY_SECONDS = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))  # How long a failed replica is skipped
+REPLICA_CHECK_SECONDS = int(os.getenv("REPLICA_CHECK_SECONDS", "5"))  # How often a healthy replica is probed
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))  # Primary pin after a write
+
+if DB_POOL_MODE not in ("null", "queue"):
+    raise ValueError(f"Invalid DB_POOL_MODE '{DB_POOL_MODE}', expected 'null' or 'queue'")
+
+
+class PoolStats:
+    """Counters used to size the connection pool (checkout wait time and connections in use)."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def checked_out(self):
+        with self._lock:
+            self.in_use += 1
+
+    def checked_in(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class _TimedCheckoutMixin:
+    # Time spent getting a connection from the pool: queueing for a free slot with
+    # QueuePool, or opening a brand new connection with NullPool.
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(url: str, is_async: bool = False) -> dict:
+    if is_memory_sqlite(url):
+        # One connection for the life of the engine; the database goes away with it
+        return {"poolclass": StaticPool}
+    if DB_POOL_MODE == "queue":
+        return {
+            "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+    return {"poolclass": TimedNullPool}
+
+
+def _connect_args(url: str) -> dict:
+    if is_sqlite(url):
+        # Sessions may be used from another thread than the one that connected
+        return {"check_same_thread": False}
+    return {"connect_timeout": DB_CONNECT_TIMEOUT}
+
+
+def _async_connect_args() -> dict:
+    if not ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
+        return {}
+    connect_args = {"timeout": DB_CONNECT_TIMEOUT}
+    if DB_POOL_MODE == "null":
+        # Transaction poolers can't keep asyncpg's per-connection prepared statements
+        connect_args["statement_cache_size"] = 0
+    return connect_args
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats.checked_out()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    pool_stats.checked_in()
+
+
+def _track_pool(sync_engine):
+    event.listen(sync_engine, "checkout", _on_checkout)
+    event.listen(sync_engine, "checkin", _on_checkin)
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # Off by default in SQLite; enforced like on Postgres so both behave the same
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _configure_dialect(sync_engine):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _enable_sqlite_foreign_keys)
+
+
+# Engines are created on first use rather than at import, so importing the app
+# (workers, CLIs, tooling) neither needs the database settings nor loads a driver
+_engine = None
+_async_engine = None
+_engine_lock = Lock()
+
+
+def get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            check_settings()
+            _engine = create_engine(
+                DATABASE_URL,
+                connect_args=_connect_args(DATABASE_URL),
+                **_engine_options(DATABASE_URL),
+            )
+            _configure_dialect(_engine)
+            _track_pool(_engine)
+        return _engine
 
-DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
 
-# NullPool disables SQLAlchemy's client-side connection pooling
-engine = create_engine(DATABASE_URL, poolclass=NullPool)
+def get_async_engine():
+    global _async_engine
+    with _engine_lock:
+        if _async_engine is None:
+            if not os.getenv("ASYNC_DATABASE_URL"):
+                check_settings()
+            _async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                connect_args=_async_connect_args(),
+                **_engine_options(ASYNC_DATABASE_URL, is_async=True),
+            )
+            _configure_dialect(_async_engine.sync_engine)
+            _track_pool(_async_engine.sync_engine)
+        return _async_engine
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def __getattr__(name):
+    # database.engine / database.async_engine still work, creating the engine on access
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_pool_stats() -> dict:
+    stats = {"mode": DB_POOL_MODE, **pool_stats.snapshot()}
+    if _engine is not None and isinstance(_engine.pool, QueuePool):
+        stats.update({
+            "pool_size": _engine.pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "overflow": _engine.pool.overflow(),
+            "idle": _engine.pool.checkedin(),
+        })
+    return stats
+
+
+class _LazyBindMixin:
+    """Session factory that binds to its engine when the first session is made"""
+
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self.engine_factory = engine_factory
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=self.engine_factory())
+        return super().__call__(**local_kw)
+
+
+class LazySessionmaker(_LazyBindMixin, sessionmaker):
+    pass
+
+
+class LazyAsyncSessionmaker(_LazyBindMixin, async_sessionmaker):
+    pass
+
+
+SessionLocal = LazySessionmaker(get_engine, autocommit=False, autoflush=False)
+
+# Async sessions can't lazy load relationships, so async queries must eager load
+# everything their response model touches.
+AsyncSessionLocal = LazyAsyncSessionmaker(
+    get_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_engine(url, connect_args={"connect_timeout": DB_CONNECT_TIMEOUT}, **_engine_options(url))
+        self.async_engine = create_async_engine(_async_url(url), connect_args=_async_connect_args(), **_engine_options(url, is_async=True))
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_session_factory = async_sessionmaker(bind=self.async_engine, autoflush=False, expire_on_commit=False)
+        self.down_until = 0.0
+        self.checked_until = 0.0
+        self._lock = Lock()
+        _track_pool(self.engine)
+        _track_pool(self.async_engine.sync_engine)
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def claim_check(self) -> bool:
+        """True for the one request per REPLICA_CHECK_SECONDS that should probe this replica"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self.checked_until:
+                return False
+            self.checked_until = now + REPLICA_CHECK_SECONDS
+            return True
+
+    def mark_down(self):
+        self.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+        self.checked_until = 0.0  # Probe again as soon as the retry delay is over
+
+
+class ReplicaSet:
+    """Round-robin over the read replicas, skipping any that recently failed to connect."""
+
+    def __init__(self, urls):
+        self.urls = urls
+        self._replicas = None  # Engines are created on first use, like the primary's
+        self._lock = Lock()
+        self._counter = count()
+
+    @property
+    def replicas(self):
+        with self._lock:
+            if self._replicas is None:
+                self._replicas = [Replica(url) for url in self.urls]
+            return self._replicas
+
+    def candidates(self):
+        if not self.replicas:
+            return []
+        start = next(self._counter) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.healthy]
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS)
+
+
+class PrimaryPins:
+    """Clients that wrote recently and must read from the primary to see their own writes.
+
+    Keyed by a digest of the Authorization header; this is per-process, so with
+    several workers a client is only pinned on the worker that took the write.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pins = {}
+
+    @staticmethod
+    def key(request: Request):
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+    def pin(self, request: Request):
+        key = self.key(request)
+        if key is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pins) > 10000:
+                self._pins = {k: until for k, until in self._pins.items() if until > now}
+            self._pins[key] = now + READ_YOUR_WRITES_SECONDS
+
+    def is_pinned(self, request: Request) -> bool:
+        key = self.key(request)
+        if key is None:
+            return False
+        with self._lock:
+            return self._pins.get(key, 0.0) > time.monotonic()
+
+
+primary_pins = PrimaryPins()
+
+
+def dispose_engines():
+    """Forget pooled connections inherited from a parent process, without closing
+    them: they belong to the parent. Call first thing in a forked worker."""
+    engines = [_engine, _async_engine and _async_engine.sync_engine]
+    for replica in replicas._replicas or []:
+        engines += [replica.engine, replica.async_engine.sync_engine]
+    for sync_engine in engines:
+        if sync_engine is not None:
+            sync_engine.dispose(close=False)
 
 Base = declarative_base()
 
@@ -39,4 +429,74 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# What connecting to a replica that is down raises: psycopg2 wraps it in an
+# OperationalError, asyncpg lets the socket error or its timeout through
+REPLICA_DOWN_ERRORS = (DBAPIError, OSError, asyncio.TimeoutError)
+
+
+def replica_unreachable(exc: BaseException) -> bool:
+    """Whether an error raised while a request used a replica means the replica itself is gone"""
+    if isinstance(exc, DBAPIError):
+        return isinstance(exc, OperationalError) or exc.connection_invalidated
+    return isinstance(exc, (OSError, asyncio.TimeoutError))
+
+
+# Read-only endpoints use these instead of get_db / get_async_db. They route to a
+# healthy replica unless the caller was pinned to the primary by a recent write.
+# Only one request per REPLICA_CHECK_SECONDS opens a connection up front to probe
+# a replica; the others connect on their first query. A replica that fails either
+# way is skipped for REPLICA_RETRY_SECONDS.
+def get_read_db(request: Request):
+    if not primary_pins.is_pinned(request):
+        for replica in replicas.candidates():
+            db = replica.session_factory()
+            if replica.claim_check():
+                try:
+                    db.connection()
+                except REPLICA_DOWN_ERRORS:
+                    db.close()
+                    replica.mark_down()
+                    continue
+            try:
+                yield db
+            except Exception as exc:
+                if replica_unreachable(exc):
+                    replica.mark_down()
+                raise
+            finally:
+                db.close()
+            return
+
+    yield from get_db()
+
+
+async def get_async_read_db(request: Request):
+    if not primary_pins.is_pinned(request):
+        for replica in replicas.candidates():
+            db = replica.async_session_factory()
+            if replica.claim_check():
+                try:
+                    await db.connection()
+                except REPLICA_DOWN_ERRORS:
+                    await db.close()
+                    replica.mark_down()
+                    continue
+            try:
+                yield db
+            except Exception as exc:
+                if replica_unreachable(exc):
+                    replica.mark_down()
+                raise
+            finally:
+                await db.close()
+            return
+
+    async with AsyncSessionLocal() as db:
+        yield db
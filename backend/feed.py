@@ -0,0 +1,218 @@
+"""Dashboard feed: the feed_items table and the code that keeps it in sync.
+
+Every post type is projected onto the DashboardCard columns by a card query below.
+A session listener re-projects the affected posts on every flush, so feed_items is
+updated in the same transaction as the write that changed it. Run
+``python feed.py rebuild`` to backfill it and ``python feed.py check`` to verify it.
+"""
+from collections import defaultdict
+import argparse
+
+from sqlalchemy import select, insert, delete, update, union_all, literal, cast, null, inspect, Float, String, event
+from sqlalchemy.orm import Session
+
+from models.user import User
+from models.feed import FeedItem
+from models.product import Product, ProductImage
+from models.trip import Trip, TripImage
+from models.event import Event, EventImage
+from models.ride import Ride
+from models.donation import Donation, DonationImage
+from models.lost_found import LostFoundItem
+
+
+def first_image(image_model, parent_fk, parent_id):
+    # Correlated lookup of a post's first image, served by the image table's parent id index
+    return (
+        select(image_model.image_path)
+        .where(parent_fk == parent_id)
+        .order_by(image_model.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def card_select(type_, model, owner_column, title, subtitle, price, image):
+    # Projects a post table onto the feed_items columns, joining the creator's username
+    return (
+        select(
+            literal(type_).label("type"),
+            model.id.label("entity_id"),
+            title.label("title"),
+            subtitle.label("subtitle"),
+            price.label("price"),
+            image.label("image"),
+            owner_column.label("creator_id"),
+            User.username.label("creator_username"),
+            model.created_at.label("created_at"),
+        )
+        .join(User, User.id == owner_column)
+    )
+
+
+# Card queries for different models (the columns of DashboardCard)
+def product_cards():
+    return card_select(
+        "product", Product, Product.creator_id,
+        title=Product.title,
+        subtitle=Product.category,
+        price=Product.price,
+        image=first_image(ProductImage, ProductImage.product_id, Product.id),
+    )
+
+def trip_cards():
+    return card_select(
+        "trip", Trip, Trip.creator_id,
+        title=Trip.title,
+        subtitle=Trip.destination,
+        price=Trip.cost_per_person,
+        image=first_image(TripImage, TripImage.trip_id, Trip.id),
+    )
+
+def event_cards():
+    return card_select(
+        "event", Event, Event.creator_id,
+        title=Event.title,
+        subtitle=Event.location,
+        price=cast(null(), Float),
+        image=first_image(EventImage, EventImage.event_id, Event.id),
+    )
+
+def ride_cards():
+    return card_select(
+        "ride", Ride, Ride.requester_id,
+        title=Ride.from_location + " to " + Ride.to_location,
+        subtitle=Ride.ride_date + " at " + Ride.ride_time,
+        price=cast(null(), Float),
+        image=cast(null(), String),
+    )
+
+def donation_cards():
+    return card_select(
+        "donation", Donation, Donation.creator_id,
+        title=Donation.title,
+        subtitle=Donation.beneficiary,
+        price=Donation.goal_amount,
+        image=first_image(DonationImage, DonationImage.donation_id, Donation.id),
+    )
+
+def lost_found_cards():
+    return card_select(
+        "lost_found", LostFoundItem, LostFoundItem.creator_id,
+        title=LostFoundItem.title,
+        subtitle=LostFoundItem.location,
+        price=cast(null(), Float),
+        image=LostFoundItem.image_path,
+    )
+
+
+# feed type -> (post model, card query)
+FEED_SOURCES = {
+    "product": (Product, product_cards),
+    "trip": (Trip, trip_cards),
+    "event": (Event, event_cards),
+    "ride": (Ride, ride_cards),
+    "donation": (Donation, donation_cards),
+    "lost_found": (LostFoundItem, lost_found_cards),
+}
+
+# image model -> (feed type, attribute holding the post id)
+FEED_IMAGES = {
+    ProductImage: ("product", "product_id"),
+    TripImage: ("trip", "trip_id"),
+    EventImage: ("event", "event_id"),
+    DonationImage: ("donation", "donation_id"),
+}
+
+FEED_COLUMNS = [
+    "type", "entity_id", "title", "subtitle", "price", "image",
+    "creator_id", "creator_username", "created_at",
+]
+
+
+def refresh_items(connection, type_, entity_ids):
+    """Re-project the given posts into feed_items; posts that no longer exist drop out"""
+    model, cards = FEED_SOURCES[type_]
+    entity_ids = list(entity_ids)
+    connection.execute(
+        delete(FeedItem).where(FeedItem.type == type_, FeedItem.entity_id.in_(entity_ids))
+    )
+    connection.execute(
+        insert(FeedItem).from_select(FEED_COLUMNS, cards().where(model.id.in_(entity_ids)))
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_feed(session, flush_context):
+    changed = defaultdict(set)
+    renamed_users = []
+
+    for obj in session.new | session.dirty | session.deleted:
+        if obj not in session.deleted and obj in session.dirty and not session.is_modified(obj):
+            continue
+        for type_, (model, _) in FEED_SOURCES.items():
+            if isinstance(obj, model):
+                changed[type_].add(obj.id)
+        if type(obj) in FEED_IMAGES:
+            type_, post_id_attr = FEED_IMAGES[type(obj)]
+            post_id = getattr(obj, post_id_attr)
+            if post_id is not None:
+                changed[type_].add(post_id)
+        if isinstance(obj, User) and obj in session.dirty and inspect(obj).attrs.username.history.has_changes():
+            renamed_users.append(obj)
+
+    if not changed and not renamed_users:
+        return
+
+    connection = session.connection()
+    for type_, entity_ids in changed.items():
+        refresh_items(connection, type_, entity_ids)
+    for user in renamed_users:
+        connection.execute(
+            update(FeedItem).where(FeedItem.creator_id == user.id).values(creator_username=user.username)
+        )
+
+
+def rebuild_feed(connection):
+    """Backfill: rebuild feed_items from scratch out of the post tables"""
+    connection.execute(delete(FeedItem))
+    for _, cards in FEED_SOURCES.values():
+        connection.execute(insert(FeedItem).from_select(FEED_COLUMNS, cards()))
+
+
+def check_feed(connection) -> dict:
+    """Compare feed_items with what the post tables project to, without changing anything"""
+    expected = {
+        (row.type, row.entity_id): tuple(row)
+        for row in connection.execute(union_all(*(cards() for _, cards in FEED_SOURCES.values())))
+    }
+    actual = {
+        (row.type, row.entity_id): tuple(row)
+        for row in connection.execute(select(*(FeedItem.__table__.c[name] for name in FEED_COLUMNS)))
+    }
+    return {
+        "missing": sorted(expected.keys() - actual.keys()),
+        "orphaned": sorted(actual.keys() - expected.keys()),
+        "stale": sorted(key for key in expected.keys() & actual.keys() if expected[key] != actual[key]),
+    }
+
+
+if __name__ == "__main__":
+    from database import get_engine
+    engine = get_engine()
+
+    parser = argparse.ArgumentParser(description="Maintain the dashboard feed_items table")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        with engine.begin() as connection:
+            rebuild_feed(connection)
+        print("feed_items rebuilt")
+    else:
+        with engine.connect() as connection:
+            problems = check_feed(connection)
+        for kind, keys in problems.items():
+            print(f"{kind}: {len(keys)}", *(f"  {type_} #{entity_id}" for type_, entity_id in keys[:20]), sep="\n")
+        if any(problems.values()):
+            raise SystemExit(1)
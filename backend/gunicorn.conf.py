@@ -0,0 +1,43 @@
+"""gunicorn settings for serving with several worker processes:
+
+    gunicorn main:app
+
+(gunicorn reads this file from the working directory). The master imports the
+app once (preload_app) and forks WEB_CONCURRENCY uvicorn workers from it, so
+they share its memory copy-on-write, along with what on_starting resolves
+before forking: the JWT signing key (see authorization/auth_token.py) and the
+bcrypt cost.
+
+Caches, rate limits, leaderboards and the bcrypt pool stay per worker.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+# Proxies whose X-Forwarded-For/-Proto are trusted, comma separated, or "*".
+# Rate limits key on the client IP (rate_limit.py), so behind a proxy that isn't
+# listed every client shares the proxy's address and one set of buckets.
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1,::1")
+accesslog = "-"
+
+
+def on_starting(server):
+    # Load or create the signing key before forking, so workers inherit it
+    from authorization.auth_token import get_secret_key
+    get_secret_key()
+
+    # Calibrate BCRYPT_ROUNDS=auto once here rather than in each worker, so all
+    # workers hash new passwords at the same cost
+    from hashing import bcrypt_rounds
+    os.environ["BCRYPT_ROUNDS"] = str(bcrypt_rounds())
+
+
+def post_fork(server, worker):
+    # Engines are lazy, but any connections the master did open belong to it
+    from database import dispose_engines
+    dispose_engines()
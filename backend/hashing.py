@@ -1,9 +1,25 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import bcrypt
 
+# Cost factor for new hashes: a number, or "auto" to pick the highest cost whose
+# hash takes at most BCRYPT_TARGET_MS on this machine, measured once at startup
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS", "12")
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+MIN_AUTO_ROUNDS = 10
+MAX_ROUNDS = 31
+
 class Hash():
     @staticmethod
-    def bcrypt(password: str):
-        salt = bcrypt.gensalt()
+    def bcrypt(password: str, rounds: int = None):
+        salt = bcrypt.gensalt(rounds or bcrypt_rounds())
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed_password.decode('utf-8')  
 
@@ -12,4 +28,136 @@ class Hash():
         return bcrypt.checkpw(
             plain_password.encode('utf-8'),
             hashed_password.encode('utf-8')
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def cost(hashed_password: str) -> int:
+        # $2b$12$<salt><hash>
+        return int(hashed_password.split('$')[2])
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        # Only ever upgrade: with BCRYPT_ROUNDS=auto, hosts can calibrate different
+        # costs, and rehashing both ways would rewrite hashes on every login
+        return Hash.cost(hashed_password) < bcrypt_rounds()
+
+
+def calibrate_rounds(target_ms: float = BCRYPT_TARGET_MS) -> int:
+    """Highest cost whose hash fits in target_ms here, never below MIN_AUTO_ROUNDS.
+    Each extra round doubles the work, so one timing at the minimum is enough."""
+    salt = bcrypt.gensalt(MIN_AUTO_ROUNDS)
+    elapsed_ms = float("inf")
+    for _ in range(3):  # Best of three, to ignore a noisy first run
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration", salt)
+        elapsed_ms = min(elapsed_ms, (time.perf_counter() - started) * 1000)
+
+    rounds = MIN_AUTO_ROUNDS
+    while rounds < MAX_ROUNDS and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+_rounds = None
+
+def bcrypt_rounds() -> int:
+    """Cost for new hashes, calibrating on first call when BCRYPT_ROUNDS=auto"""
+    global _rounds
+    if _rounds is None:
+        _rounds = calibrate_rounds() if BCRYPT_ROUNDS.lower() == "auto" else int(BCRYPT_ROUNDS)
+    return _rounds
+
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(HASH_WORKERS * 8)))  # Hashes running or waiting
+HASH_RETRY_AFTER = int(os.getenv("HASH_RETRY_AFTER", "2"))  # Seconds, sent with 503s
+
+
+class HashPoolBusy(Exception):
+    """Raised instead of queueing when HASH_QUEUE_LIMIT hashes are already in flight"""
+
+
+class HashPool:
+    """bcrypt on a dedicated process pool, so a burst of logins can't occupy the
+    request threads and the CPU every other endpoint needs.
+
+    The pool starts on first use, so each server worker gets its own. Its
+    processes come from a forkserver (spawn where that's unavailable), never
+    from forking the server worker itself, whose event loop, threadpool and
+    driver state can't be safely copied into a child.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(start_method))
+            return self._executor
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.queue_limit:
+                self.rejected += 1
+                raise HashPoolBusy()
+            self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                # One dead pool process (e.g. OOM killed) breaks the whole executor
+                # for good: replace it, and retry once since bcrypt is safe to repeat
+                self._discard(executor)
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rounds": _rounds, "workers": self.workers, "queue_limit": self.queue_limit, "in_flight": self.in_flight, "rejected": self.rejected}
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+hash_pool = HashPool()
+
+
+async def hash_password(password: str) -> str:
+    # Rounds are resolved here so pool processes never calibrate on their own
+    return await hash_pool.run(Hash.bcrypt, password, bcrypt_rounds())
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.run(Hash.verify, plain_password, hashed_password)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="bcrypt cost for this machine")
+    parser.add_argument("--target-ms", type=float, default=BCRYPT_TARGET_MS)
+    args = parser.parse_args()
+
+    rounds = calibrate_rounds(args.target_ms)
+    started = time.perf_counter()
+    Hash.bcrypt("calibration", rounds)
+    print(f"BCRYPT_ROUNDS={rounds} ({(time.perf_counter() - started) * 1000:.0f} ms per hash, target {args.target_ms:.0f} ms)")
@@ -0,0 +1,100 @@
+"""In-memory leaderboards of the best rated cafes and societies.
+
+Raw averages let one 5-star review top the list, so entries are ranked by a
+Bayesian average: every cafe/society starts with LEADERBOARD_PRIOR_WEIGHT
+imaginary reviews at the global mean rating, which a real track record
+outweighs. Each process loads the ranking from the running aggregates (see
+ratings.py), applies its own review writes in place, and reloads every
+LEADERBOARD_TTL seconds to pick up the other workers' writes and a new global mean.
+"""
+from bisect import bisect_left, insort
+import os
+import threading
+import time
+
+from sqlalchemy import select
+
+from models.cafe import Cafe
+from models.society import Society
+from ratings import average_rating
+
+LEADERBOARD_PRIOR_WEIGHT = float(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "5"))
+LEADERBOARD_TTL = float(os.getenv("LEADERBOARD_TTL", "60"))
+
+
+class Leaderboard:
+    def __init__(self, model, ttl: float = LEADERBOARD_TTL, prior_weight: float = LEADERBOARD_PRIOR_WEIGHT):
+        self.model = model
+        self.ttl = ttl
+        self.prior_weight = prior_weight
+        self.prior_mean = 0.0
+        self._entries = {}   # id -> entry dict
+        self._ranking = []   # (-score, id), best first
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def score(self, rating_sum: float, review_count: int) -> float:
+        return (self.prior_weight * self.prior_mean + rating_sum) / (self.prior_weight + review_count)
+
+    def stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def load(self, db):
+        """Rebuild the ranking from the aggregate columns, in one query"""
+        model = self.model
+        rows = db.execute(
+            select(model.id, model.name, model.image_url, model.rating_sum, model.review_count)
+            .where(model.review_count > 0)
+        ).all()
+        with self._lock:
+            total_count = sum(row.review_count for row in rows)
+            self.prior_mean = sum(row.rating_sum for row in rows) / total_count if total_count else 0.0
+            self._entries = {}
+            self._ranking = []
+            for row in rows:
+                entry = self._entries[row.id] = {"id": row.id, "name": row.name, "image_url": row.image_url}
+                self._fill(entry, row.rating_sum, row.review_count)
+                self._ranking.append((-entry["score"], row.id))
+            self._ranking.sort()
+            self._loaded_at = time.monotonic()
+
+    def _fill(self, entry: dict, rating_sum: float, review_count: int):
+        entry.update(
+            score=round(self.score(rating_sum, review_count), 4),
+            average_rating=average_rating(rating_sum, review_count),
+            review_count=review_count,
+        )
+
+    def update(self, entity_id: int, rating_sum: float, review_count: int):
+        """Apply a cafe/society's new aggregates after one of its reviews changed"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            entry = self._entries.get(entity_id)
+            if entry is None:
+                # First review: name and image come with the next reload
+                self._loaded_at = None
+                return
+            del self._ranking[bisect_left(self._ranking, (-entry["score"], entity_id))]
+            if review_count <= 0:
+                del self._entries[entity_id]
+                return
+            self._fill(entry, rating_sum, review_count)
+            insort(self._ranking, (-entry["score"], entity_id))
+
+    def invalidate(self):
+        """Reload on next use, e.g. after a cafe/society was renamed or deleted"""
+        with self._lock:
+            self._loaded_at = None
+
+    def top(self, db, limit: int) -> list:
+        if self.stale():
+            self.load(db)
+        with self._lock:
+            return [dict(self._entries[entity_id]) for _, entity_id in self._ranking[:limit]]
+
+
+leaderboards = {
+    Cafe: Leaderboard(Cafe),
+    Society: Leaderboard(Society),
+}
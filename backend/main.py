@@ -1,30 +1,83 @@
-from fastapi import FastAPI
-from routers import user, authentication, donation, product, trip, event, lost_found, ride, dashboard, cafe, society, profile
-from database import engine, Base
+from contextlib import asynccontextmanager
+import os
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from routers import user, authentication, donation, product, trip, event, lost_found, ride, dashboard, cafe, society, profile, search, autocomplete, health
+from database import Base, get_engine, primary_pins
 from fastapi.middleware.cors import CORSMiddleware
+import feed  # Registers the listener that keeps feed_items in sync with the post tables
+from query_budget import QueryBudgetMiddleware, QUERY_BUDGET_MODE
+from hashing import HashPoolBusy, HASH_RETRY_AFTER, bcrypt_rounds, hash_pool
 
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
-
-app.add_middleware(
-       CORSMiddleware,
-       allow_origins=["*"],  
-       allow_credentials=True,
-       allow_methods=["*"],
-       allow_headers=["*"],
-   )
-
-# Include the user router
-app.include_router(user.router)
-app.include_router(authentication.router)
-app.include_router(donation.router)
-app.include_router(product.router)
-app.include_router(trip.router)
-app.include_router(event.router)
-app.include_router(lost_found.router) 
-app.include_router(ride.router)  
-app.include_router(dashboard.router)
-app.include_router(cafe.router) 
-app.include_router(society.router)
-app.include_router(profile.router)
\ No newline at end of file
+# The schema is managed by Alembic (alembic upgrade head). Set this to create
+# missing tables at startup instead, e.g. for a throwaway local database.
+DB_CREATE_SCHEMA = os.getenv("DB_CREATE_SCHEMA", "false").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_SCHEMA:
+        Base.metadata.create_all(bind=get_engine())
+    # Resolve the bcrypt cost now, so BCRYPT_ROUNDS=auto calibrates before the first signup does
+    bcrypt_rounds()
+    yield
+    hash_pool.shutdown()
+
+
+def create_app() -> FastAPI:
+    """Build the API. Nothing here touches the database: engines are created by
+    the first request that needs one."""
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Link"],  # Next-page links of cursor paginated lists
+    )
+
+    # Pin clients to the primary for a short while after a successful write, so
+    # reads routed through get_read_db see their own changes despite replica lag
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            primary_pins.pin(request)
+        return response
+
+    # The bcrypt pool is full: shed the request rather than queue it behind seconds of hashing
+    @app.exception_handler(HashPoolBusy)
+    async def hash_pool_busy(request: Request, exc: HashPoolBusy):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server busy, try again shortly"},
+            headers={"Retry-After": str(HASH_RETRY_AFTER)},
+        )
+
+    # Count SQL statements per request and check them against each route's query_budget
+    if QUERY_BUDGET_MODE != "off":
+        app.add_middleware(QueryBudgetMiddleware)
+
+    # Include the user router
+    app.include_router(user.router)
+    app.include_router(authentication.router)
+    app.include_router(donation.router)
+    app.include_router(product.router)
+    app.include_router(trip.router)
+    app.include_router(event.router)
+    app.include_router(lost_found.router)
+    app.include_router(ride.router)
+    app.include_router(dashboard.router)
+    app.include_router(cafe.router)
+    app.include_router(society.router)
+    app.include_router(profile.router)
+    app.include_router(search.router)
+    app.include_router(autocomplete.router)
+    app.include_router(health.router)
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,124 @@
+"""Lost-to-found matching: pairs each lost item with found items that look like it.
+
+When an item is created or edited, the opposite-type items of the same category
+reported within MATCH_WINDOW_DAYS are read through the (type, category, date)
+index, at most MATCH_CANDIDATES of them, closest in date first, and scored on
+how many words their title, description and location share. The best MATCH_LIMIT pairs are stored
+in lost_found_matches, so the work per write is bounded whatever the table
+size. Run ``python matching.py rebuild`` to match the items already stored.
+"""
+from datetime import timedelta
+from itertools import islice
+import argparse
+import heapq
+import os
+import re
+
+from sqlalchemy import select, delete, or_
+from sqlalchemy.orm import Session
+
+from models.lost_found import LostFoundItem, LostFoundMatch, ItemStatus, ItemType
+
+MATCH_WINDOW_DAYS = int(os.getenv("MATCH_WINDOW_DAYS", "14"))
+MATCH_CANDIDATES = int(os.getenv("MATCH_CANDIDATES", "200"))
+MATCH_LIMIT = int(os.getenv("MATCH_LIMIT", "10"))
+MATCH_MIN_SCORE = float(os.getenv("MATCH_MIN_SCORE", "0.1"))
+
+# How much each field's word overlap counts towards the score
+WEIGHTS = {"title": 0.5, "description": 0.2, "location": 0.3}
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def words(text: str) -> set:
+    return set(WORD.findall(text.lower())) if text else set()
+
+
+def overlap(a: set, b: set) -> float:
+    # Jaccard similarity of two word sets
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def score(item: LostFoundItem, candidate: LostFoundItem) -> float:
+    return sum(
+        weight * overlap(words(getattr(item, field)), words(getattr(candidate, field)))
+        for field, weight in WEIGHTS.items()
+    )
+
+
+def candidates(db: Session, item: LostFoundItem):
+    """The MATCH_CANDIDATES opposite-type items of the same category reported closest
+    in time to the item, within MATCH_WINDOW_DAYS either side"""
+    window = timedelta(days=MATCH_WINDOW_DAYS)
+    opposite = ItemType.found if item.type == ItemType.lost else ItemType.lost
+    same_kind = db.query(LostFoundItem).filter(
+        LostFoundItem.type == opposite,
+        LostFoundItem.category == item.category,
+        LostFoundItem.status != ItemStatus.CLAIMED,
+    )
+
+    # Walk the (type, category, date) index outwards from the item's date in both
+    # directions, as /rides/match does; each side comes in order of distance, so
+    # the closest candidates are a merge of the two, read in two bounded scans
+    later = (
+        same_kind.filter(LostFoundItem.date >= item.date, LostFoundItem.date <= item.date + window)
+        .order_by(LostFoundItem.date, LostFoundItem.id)
+        .limit(MATCH_CANDIDATES)
+        .all()
+    )
+    earlier = (
+        same_kind.filter(LostFoundItem.date < item.date, LostFoundItem.date >= item.date - window)
+        .order_by(LostFoundItem.date.desc(), LostFoundItem.id.desc())
+        .limit(MATCH_CANDIDATES)
+        .all()
+    )
+    return list(islice(heapq.merge(later, earlier, key=lambda candidate: abs(candidate.date - item.date)), MATCH_CANDIDATES))
+
+
+def record_matches(db: Session, item: LostFoundItem):
+    """Replace the stored matches of a (flushed) item with its current best candidates"""
+    db.execute(
+        delete(LostFoundMatch).where(
+            or_(LostFoundMatch.lost_item_id == item.id, LostFoundMatch.found_item_id == item.id)
+        )
+    )
+    scored = sorted(
+        ((score(item, candidate), candidate) for candidate in candidates(db, item)),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )
+    for match_score, candidate in scored[:MATCH_LIMIT]:
+        if match_score < MATCH_MIN_SCORE:
+            break
+        lost, found = (item, candidate) if item.type == ItemType.lost else (candidate, item)
+        db.add(LostFoundMatch(lost_item_id=lost.id, found_item_id=found.id, score=match_score))
+
+
+def rebuild_matches(db: Session, batch_size: int = 500):
+    """Backfill: match every unclaimed lost item, in id order (pairing is symmetric,
+    so the found items are covered as their candidates)"""
+    db.execute(delete(LostFoundMatch))
+    item_ids = db.scalars(
+        select(LostFoundItem.id)
+        .where(LostFoundItem.type == ItemType.lost, LostFoundItem.status != ItemStatus.CLAIMED)
+        .order_by(LostFoundItem.id)
+    ).all()
+    for start in range(0, len(item_ids), batch_size):
+        batch = item_ids[start:start + batch_size]
+        for item in db.scalars(select(LostFoundItem).where(LostFoundItem.id.in_(batch))).all():
+            record_matches(db, item)
+        db.flush()
+        db.expunge_all()
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the lost_found_matches table")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    with SessionLocal() as db:
+        rebuild_matches(db)
+        db.commit()
+    print("lost_found_matches rebuilt")
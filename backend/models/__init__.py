@@ -4,6 +4,7 @@ from .trip import Trip, TripImage
 from .event import Event
 from .donation import Donation
 from .ride import Ride
+from .feed import FeedItem
 
 __all__ = [
     "User",
@@ -13,4 +14,5 @@ __all__ = [
     "Event",
     "Donation",
     "Ride",
+    "FeedItem",
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Float
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, Text, Float, DateTime
 from sqlalchemy.orm import relationship
 from database import Base
+from datetime import datetime
 
 class Cafe(Base):
     __tablename__ = "cafes"
@@ -8,7 +9,10 @@ class Cafe(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     image_url = Column(String, nullable=True)  
-    rating = Column(Float, nullable=True)
+    rating = Column(Float, nullable=True)  # Average of the reviews, kept with the two columns below
+    # Running aggregates of the reviews, maintained by ratings.adjust_rating
+    rating_sum = Column(Float, nullable=False, default=0, server_default="0")
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     reviews = relationship("Review", back_populates="cafe", cascade="all, delete-orphan")
 
@@ -20,6 +24,14 @@ class Review(Base):
     comment = Column(Text, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     cafe_id = Column(Integer, ForeignKey("cafes.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
     creator = relationship("User")
-    cafe = relationship("Cafe", back_populates="reviews")
\ No newline at end of file
+    cafe = relationship("Cafe", back_populates="reviews")
+
+
+# A cafe's reviews, newest first or highest rated first, with the id tie-breaker
+Index("ix_reviews_cafe_id_created_at_id", Review.cafe_id, Review.created_at.desc(), Review.id.desc())
+Index("ix_reviews_cafe_id_rating_id", Review.cafe_id, Review.rating.desc(), Review.id.desc())
+# One review per user; also the conflict target of ratings.upsert_review
+Index("uq_reviews_user_id_cafe_id", Review.user_id, Review.cafe_id, unique=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, Float, Date, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -25,6 +25,11 @@ class DonationImage(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     image_path = Column(String, nullable=False)
-    donation_id = Column(Integer, ForeignKey('donations.id', ondelete='CASCADE'))
+    donation_id = Column(Integer, ForeignKey('donations.id', ondelete='CASCADE'), index=True)
     
-    donation = relationship("Donation", back_populates="images")
\ No newline at end of file
+    donation = relationship("Donation", back_populates="images")
+
+
+# Newest-first keyset pagination on (created_at, id), overall and per user ("/me", profile)
+Index("ix_donations_creator_id_created_at_id", Donation.creator_id, Donation.created_at.desc(), Donation.id.desc())
+Index("ix_donations_created_at_id", Donation.created_at.desc(), Donation.id.desc())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -30,6 +30,13 @@ class EventImage(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     image_path = Column(String, nullable=False)
-    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'))
+    event_id = Column(Integer, ForeignKey('events.id', ondelete='CASCADE'), index=True)
     
-    event = relationship("Event", back_populates="images")
\ No newline at end of file
+    event = relationship("Event", back_populates="images")
+
+
+# Newest-first keyset pagination on (created_at, id), overall and per user ("/me", profile)
+Index("ix_events_creator_id_created_at_id", Event.creator_id, Event.created_at.desc(), Event.id.desc())
+Index("ix_events_created_at_id", Event.created_at.desc(), Event.id.desc())
+Index("ix_events_society_event_date", Event.society, Event.event_date)
+Index("ix_events_event_date", Event.event_date)
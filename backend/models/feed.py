@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime
+from database import Base
+
+
+class FeedItem(Base):
+    """Denormalised dashboard card, one per post, kept in sync by feed.py on every flush"""
+    __tablename__ = 'feed_items'
+
+    type = Column(String, primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    subtitle = Column(String, nullable=True)
+    price = Column(Float, nullable=True)
+    image = Column(String, nullable=True)
+    creator_id = Column(Integer, nullable=True, index=True)
+    creator_username = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+
+
+# Newest-first feed and its cursor, optionally filtered by type
+Index("ix_feed_items_created_at_type_entity_id", FeedItem.created_at.desc(), FeedItem.type.desc(), FeedItem.entity_id.desc())
+Index("ix_feed_items_type_created_at_entity_id", FeedItem.type, FeedItem.created_at.desc(), FeedItem.entity_id.desc())
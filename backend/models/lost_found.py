@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, Float, Date, DateTime, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -41,4 +41,25 @@ class LostFoundItem(Base):
     
     creator_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'))
     
-    creator = relationship("User", back_populates="lost_found_items")
\ No newline at end of file
+    creator = relationship("User", back_populates="lost_found_items")
+
+
+class LostFoundMatch(Base):
+    """A scored lost/found pair that may be the same object, written by matching.py"""
+    __tablename__ = 'lost_found_matches'
+
+    lost_item_id = Column(Integer, ForeignKey('lost_found_items.id', ondelete='CASCADE'), primary_key=True)
+    found_item_id = Column(Integer, ForeignKey('lost_found_items.id', ondelete='CASCADE'), primary_key=True, index=True)
+    score = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Newest-first keyset pagination on (created_at, id), overall and per user ("/me", profile)
+Index("ix_lost_found_items_creator_id_created_at_id", LostFoundItem.creator_id, LostFoundItem.created_at.desc(), LostFoundItem.id.desc())
+Index("ix_lost_found_items_created_at_id", LostFoundItem.created_at.desc(), LostFoundItem.id.desc())
+Index("ix_lost_found_items_category_created_at_id", LostFoundItem.category, LostFoundItem.created_at.desc(), LostFoundItem.id.desc())
+Index("ix_lost_found_items_type_status_created_at_id", LostFoundItem.type, LostFoundItem.status, LostFoundItem.created_at.desc(), LostFoundItem.id.desc())
+Index("ix_lost_found_items_date", LostFoundItem.date)
+
+# Match candidates: opposite type, same category, within a date window
+Index("ix_lost_found_items_type_category_date", LostFoundItem.type, LostFoundItem.category, LostFoundItem.date)
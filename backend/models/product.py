@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Float, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -27,6 +27,14 @@ class ProductImage(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     image_path = Column(String, nullable=False)
-    product_id = Column(Integer, ForeignKey('products.id', ondelete='CASCADE'))
+    product_id = Column(Integer, ForeignKey('products.id', ondelete='CASCADE'), index=True)
 
-    product = relationship("Product", back_populates="images")
\ No newline at end of file
+    product = relationship("Product", back_populates="images")
+
+
+# Newest-first keyset pagination on (created_at, id), overall and per user ("/me", profile)
+Index("ix_products_creator_id_created_at_id", Product.creator_id, Product.created_at.desc(), Product.id.desc())
+Index("ix_products_created_at_id", Product.created_at.desc(), Product.id.desc())
+Index("ix_products_category_created_at_id", Product.category, Product.created_at.desc(), Product.id.desc())
+Index("ix_products_condition_created_at_id", Product.condition, Product.created_at.desc(), Product.id.desc())
+Index("ix_products_price", Product.price)
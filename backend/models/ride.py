@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -13,6 +13,8 @@ class Ride(Base):
     to_location = Column(String, nullable=False, index=True)
     ride_date = Column(String, nullable=False, index=True)  
     ride_time = Column(String, nullable=False)  
+    # ride_date + ride_time as a UTC instant, for range scans; NULL when they don't parse
+    departure_at = Column(DateTime(timezone=True), nullable=True)
     
     contact = Column(String, nullable=False)
     
@@ -21,4 +23,12 @@ class Ride(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    requester = relationship("User", back_populates="created_rides")
\ No newline at end of file
+    requester = relationship("User", back_populates="created_rides")
+
+
+# Newest-first keyset pagination on (created_at, id), overall and per user ("/me", profile)
+Index("ix_rides_requester_id_created_at_id", Ride.requester_id, Ride.created_at.desc(), Ride.id.desc())
+Index("ix_rides_created_at_id", Ride.created_at.desc(), Ride.id.desc())
+
+# Ride matching: equality on the route, then a range scan on departure time
+Index("ix_rides_from_location_to_location_departure_at", Ride.from_location, Ride.to_location, Ride.departure_at)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -10,6 +10,9 @@ class Society(Base):
     name = Column(String, nullable=False)
     instagram_url = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    # Running aggregates of the reviews, maintained by ratings.adjust_rating
+    rating_sum = Column(Float, nullable=False, default=0, server_default="0")
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     reviews = relationship("SocietyReview", back_populates="society", cascade="all, delete-orphan")
 
@@ -23,6 +26,14 @@ class SocietyReview(Base):
 
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'))
     society_id = Column(Integer, ForeignKey('societies.id', ondelete='CASCADE'))
+    created_at = Column(DateTime, default=datetime.utcnow)
 
     creator = relationship("User", back_populates="society_reviews")
-    society = relationship("Society", back_populates="reviews")
\ No newline at end of file
+    society = relationship("Society", back_populates="reviews")
+
+
+# A society's reviews, newest first or highest rated first, with the id tie-breaker
+Index("ix_society_reviews_society_id_created_at_id", SocietyReview.society_id, SocietyReview.created_at.desc(), SocietyReview.id.desc())
+Index("ix_society_reviews_society_id_rating_id", SocietyReview.society_id, SocietyReview.rating.desc(), SocietyReview.id.desc())
+# One review per user; also the conflict target of ratings.upsert_review
+Index("uq_society_reviews_user_id_society_id", SocietyReview.user_id, SocietyReview.society_id, unique=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, Float, Date, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -33,6 +33,13 @@ class TripImage(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     image_path = Column(String, nullable=False)
-    trip_id = Column(Integer, ForeignKey('trips.id', ondelete='CASCADE'))
+    trip_id = Column(Integer, ForeignKey('trips.id', ondelete='CASCADE'), index=True)
     
-    trip = relationship("Trip", back_populates="images")
\ No newline at end of file
+    trip = relationship("Trip", back_populates="images")
+
+
+# Newest-first keyset pagination on (created_at, id), overall and per user ("/me", profile)
+Index("ix_trips_creator_id_created_at_id", Trip.creator_id, Trip.created_at.desc(), Trip.id.desc())
+Index("ix_trips_created_at_id", Trip.created_at.desc(), Trip.id.desc())
+Index("ix_trips_destination_created_at_id", Trip.destination, Trip.created_at.desc(), Trip.id.desc())
+Index("ix_trips_start_date", Trip.start_date)
@@ -0,0 +1,117 @@
+"""Keyset ("seek") pagination with opaque cursors.
+
+A cursor is the sort key of the last row of a page, base64 encoded so clients
+treat it as a token. The next page is returned through a ``Link: <...>; rel="next"``
+header, which keeps list responses as plain JSON arrays.
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+import base64
+import binascii
+import json
+import os
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+REVIEW_PAGE_SIZE = int(os.getenv("REVIEW_PAGE_SIZE", "20"))
+
+
+def encode_cursor(*values) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Decode a cursor whose values have the given types (e.g. datetime, str, int)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(values, types)
+        )
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def set_next_link(request: Request, response: Response, next_cursor):
+    if next_cursor is not None:
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+
+class Paginator:
+    """List endpoint dependency: newest first on (created_at, id), one page per request.
+
+    Works with both ``db.query(...)`` and ``select(...)``:
+
+        page.finish(page.apply(db.query(Product), Product).all())
+
+    After ``finish`` the next page's cursor is also available as ``next_cursor``.
+    """
+
+    # (attribute, type) of the descending sort key, most significant first
+    sort_key = (("created_at", datetime), ("id", int))
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1),
+        skip: Optional[int] = Query(None, include_in_schema=False),
+    ):
+        # Offset paging is gone; fail loudly rather than serve page one again
+        if skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="skip is not supported, follow the cursor in the Link header instead",
+            )
+        self.request = request
+        self.response = response
+        self.cursor = cursor
+        self.limit = min(limit, MAX_PAGE_SIZE)
+        self.next_cursor = None
+
+    def apply(self, query, model):
+        columns = [getattr(model, name) for name, _ in self.sort_key]
+        if self.cursor:
+            after = decode_cursor(self.cursor, *(type_ for _, type_ in self.sort_key))
+            query = query.filter(tuple_(*columns) < tuple_(*after))
+        # One extra row tells us whether there is a next page
+        return query.order_by(*(column.desc() for column in columns)).limit(self.limit + 1)
+
+    def finish(self, rows):
+        rows = list(rows)
+        if len(rows) > self.limit:
+            last = rows[self.limit - 1]
+            self.next_cursor = encode_cursor(*(getattr(last, name) for name, _ in self.sort_key))
+            set_next_link(self.request, self.response, self.next_cursor)
+        return rows[:self.limit]
+
+
+class ReviewSort(str, Enum):
+    RECENT = "recent"
+    RATING = "rating"
+
+
+class ReviewPaginator(Paginator):
+    """Review listings: newest first, or highest rated first with ?sort=rating"""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = None,
+        limit: int = Query(REVIEW_PAGE_SIZE, ge=1),
+        sort: ReviewSort = ReviewSort.RECENT,
+    ):
+        super().__init__(request, response, cursor, limit)
+        if sort is ReviewSort.RATING:
+            self.sort_key = (("rating", float), ("id", int))
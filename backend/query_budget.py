@@ -0,0 +1,95 @@
+"""Per-request SQL statement counting, to catch N+1 queries.
+
+Routes declare how many statements they may run:
+
+    @router.get("/", dependencies=[query_budget(2)])
+
+With QUERY_BUDGET_MODE=enforce (tests, benchmarks) a request that goes over
+its budget is answered with a 500 instead of its normal response; with "warn"
+it is only logged. Either mode adds an X-Query-Count header. The default, "off",
+installs nothing.
+"""
+from contextvars import ContextVar
+import json
+import logging
+import os
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "off").lower()
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestQueries:
+    def __init__(self):
+        self.count = 0
+        self.budget = None
+
+
+# Holds a mutable counter rather than an int: sync endpoints run in the threadpool
+# on a copy of the context, so only in-place updates are seen by the middleware
+_current = ContextVar("request_queries", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    if queries is not None:
+        queries.count += 1
+
+
+def query_budget(max_statements: int):
+    """Route dependency declaring the most SQL statements the route may run"""
+    def declare_budget():
+        queries = _current.get()
+        if queries is not None:
+            queries.budget = max_statements
+    return Depends(declare_budget)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app, mode: str = QUERY_BUDGET_MODE):
+        self.app = app
+        self.enforce = mode == "enforce"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        queries = _RequestQueries()
+        token = _current.set(queries)
+        over_budget = False
+
+        async def send_with_count(message):
+            nonlocal over_budget
+            if message["type"] == "http.response.start":
+                over_budget = queries.budget is not None and queries.count > queries.budget
+                if over_budget:
+                    detail = f"{scope['method']} {scope['path']} ran {queries.count} SQL statements, budget is {queries.budget}"
+                    logger.warning("Query budget exceeded: %s", detail)
+                    if self.enforce:
+                        body = json.dumps({"detail": f"Query budget exceeded: {detail}"}).encode("utf-8")
+                        await send({
+                            "type": "http.response.start",
+                            "status": 500,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                                (b"x-query-count", str(queries.count).encode()),
+                            ],
+                        })
+                        await send({"type": "http.response.body", "body": body})
+                        return
+                message["headers"] = list(message.get("headers", [])) + [(b"x-query-count", str(queries.count).encode())]
+            elif over_budget and self.enforce:
+                # The replacement response has already been sent
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current.reset(token)
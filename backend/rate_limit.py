@@ -0,0 +1,62 @@
+"""Token-bucket rate limits keyed by client IP, account, or anything else hashable.
+
+Each key gets a bucket of ``burst`` tokens, refilled at ``rate`` tokens per
+second; a request takes one token or is answered 429 with a Retry-After. Buckets
+live in the worker process, so with N workers a client can get up to N times the
+configured rate. Idle buckets are evicted least recently used first.
+
+Client IPs come from X-Forwarded-For when the request comes from a trusted
+proxy: set FORWARDED_ALLOW_IPS to the proxy's addresses (default 127.0.0.1;
+"*" only when the app is reachable through nothing else, or any client can
+pick its own IP). Otherwise all clients behind the proxy share one bucket. Limits are set per router: LOGIN_IP_BURST/LOGIN_IP_PER_MINUTE,
+LOGIN_ACCOUNT_BURST/LOGIN_ACCOUNT_PER_MINUTE and
+SIGNUP_IP_BURST/SIGNUP_IP_PER_MINUTE.
+"""
+from collections import OrderedDict
+import math
+import threading
+import time
+
+from fastapi import HTTPException, Request, status
+
+
+def client_ip(request: Request) -> str:
+    # The proxy headers middleware (uvicorn, and gunicorn via uvicorn-worker) has
+    # already replaced this with X-Forwarded-For when the peer is in FORWARDED_ALLOW_IPS
+    return request.client.host if request.client else "unknown"
+
+
+class TokenBuckets:
+    def __init__(self, name: str, burst: int, rate: float, max_keys: int = 100_000):
+        self.name = name
+        self.burst = burst
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at), least recently used first
+        self._lock = threading.Lock()
+
+    def take(self, key) -> float:
+        """Take a token; returns 0 on success, else the seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def limit(self, key):
+        """Take a token or raise 429"""
+        wait = self.take(key)
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
@@ -0,0 +1,201 @@
+"""Running rating aggregates on cafes and societies.
+
+cafes and societies carry rating_sum and review_count, adjusted by the review
+endpoints in the same transaction as the review write, so listing ratings is a
+plain scan instead of an AVG/COUNT over the review tables. Review writes hold
+the cafe/society row lock; on PostgreSQL creating or editing a review is then a
+single statement that upserts it and adjusts them. Cafe.rating holds the
+resulting average. Anything that bypasses the endpoints (deleting a user,
+manual SQL) can make them drift: ``python ratings.py check`` reports drifted
+rows and ``python ratings.py reconcile`` recomputes them from the reviews.
+"""
+from datetime import datetime
+import argparse
+
+from sqlalchemy import select, update, delete, exists, func, case, or_, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from models.cafe import Cafe, Review
+from models.society import Society, SocietyReview
+
+# rated model -> (review model, review column pointing at it)
+RATED = {
+    Cafe: (Review, Review.cafe_id),
+    Society: (SocietyReview, SocietyReview.society_id),
+}
+
+
+def average_rating(rating_sum, review_count) -> float:
+    return round(rating_sum / review_count, 2) if review_count else 0.0
+
+
+def _adjusted(model, rating_delta, count_delta) -> dict:
+    # SET clause moving the aggregates by the given amounts (numbers or SQL expressions)
+    values = {
+        "rating_sum": model.rating_sum + rating_delta,
+        "review_count": model.review_count + count_delta,
+    }
+    if model is Cafe:
+        new_count = Cafe.review_count + count_delta
+        values["rating"] = case((new_count > 0, (Cafe.rating_sum + rating_delta) / new_count), else_=None)
+    return values
+
+
+def adjust_rating(db, model, entity_id: int, rating_delta: float, count_delta: int):
+    """Add a review's rating (count_delta=1) or remove it (count_delta=-1, negative rating_delta).
+
+    A single UPDATE reading the row's own columns, so concurrent reviews can't
+    lose each other's changes; it takes part in the caller's transaction.
+    Returns the new (rating_sum, review_count), or None if the row doesn't exist.
+    """
+    return db.execute(
+        update(model.__table__)
+        .where(model.__table__.c.id == entity_id)
+        .values(**_adjusted(model, rating_delta, count_delta))
+        .returning(model.__table__.c.rating_sum, model.__table__.c.review_count)
+    ).first()
+
+
+def _lock_rated(db, model, entity_id: int) -> bool:
+    # FOR UPDATE on the cafe/society row, so review writes to it take turns (SQLite
+    # serialises writers anyway). False if the row doesn't exist.
+    rated = model.__table__
+    return db.execute(select(rated.c.id).where(rated.c.id == entity_id).with_for_update()).first() is not None
+
+
+def upsert_review(db, model, entity_id: int, user_id: int, rating: float, comment):
+    """Create the user's review of a cafe/society, or edit it if there is one, and adjust
+    the aggregates. Returns (review row, created, (rating_sum, review_count)), or None
+    if the cafe/society doesn't exist.
+
+    Relies on the unique (user_id, parent) index. On PostgreSQL the cafe/society
+    row is locked first, so the old rating read next is the one the upsert
+    replaces, even when the same user submits twice at once; the rest is one
+    statement whose CTEs all read the snapshot taken once the lock is held, so
+    "old" sees the review as it was before "upserted" changed it. SQLite
+    serialises writers and runs the read, the upsert and the adjustment as
+    separate statements, as before.
+    """
+    review_model, foreign_key = RATED[model]
+    reviews = review_model.__table__
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    # SQLite needs no lock, and finds a missing cafe/society by its foreign key
+    if dialect == "postgresql" and not _lock_rated(db, model, entity_id):
+        db.rollback()
+        return None
+
+    mine = (reviews.c.user_id == user_id) & (reviews.c[foreign_key.key] == entity_id)
+    upsert = insert(reviews).values(
+        rating=rating, comment=comment, user_id=user_id, created_at=datetime.utcnow(), **{foreign_key.key: entity_id}
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[reviews.c.user_id, reviews.c[foreign_key.key]],
+        set_={"rating": upsert.excluded.rating, "comment": upsert.excluded.comment},
+    )
+
+    if dialect == "postgresql":
+        old = select(reviews.c.rating).where(mine).cte("old")
+        upserted = upsert.returning(*reviews.c).cte("upserted")
+        created = ~exists(old.select())
+        old_rating = func.coalesce(select(old.c.rating).scalar_subquery(), 0)
+        adjusted = (
+            update(model.__table__)
+            .where(model.__table__.c.id == entity_id)
+            .values(**_adjusted(model, rating - old_rating, case((created, 1), else_=0)))
+            .returning(model.__table__.c.rating_sum, model.__table__.c.review_count)
+            .cte("adjusted")
+        )
+        row = db.execute(
+            select(upserted, created.label("created"), adjusted)
+            .select_from(upserted.join(adjusted, literal_column("true")))
+        ).one()
+        return row, row.created, (row.rating_sum, row.review_count)
+
+    old_rating = db.execute(select(reviews.c.rating).where(mine)).scalar()
+    try:
+        row = db.execute(upsert.returning(*reviews.c)).one()
+    except IntegrityError:
+        # Foreign key to a cafe/society that doesn't exist
+        db.rollback()
+        return None
+    created = old_rating is None
+    totals = adjust_rating(db, model, entity_id, rating - (old_rating or 0), 1 if created else 0)
+    return row, created, tuple(totals)
+
+
+def remove_review(db, model, review):
+    """Delete a review and take its rating out of the aggregates. Returns the new
+    (rating_sum, review_count), or None if it was already deleted.
+
+    Holds the cafe/society row lock like upsert_review, and the rating taken out
+    is the one the DELETE removed, so an edit made since the review was loaded
+    can't make the aggregates drift.
+    """
+    review_model, foreign_key = RATED[model]
+    reviews = review_model.__table__
+    entity_id = getattr(review, foreign_key.key)
+
+    _lock_rated(db, model, entity_id)
+    rating = db.execute(delete(reviews).where(reviews.c.id == review.id).returning(reviews.c.rating)).scalar()
+    db.expunge(review)  # Its row is gone; keep the loaded attributes readable after commit
+    if rating is None:
+        return None  # Deleted concurrently, which already took it out of the aggregates
+    return adjust_rating(db, model, entity_id, -rating, -1)
+
+
+def _actual(model):
+    review_model, foreign_key = RATED[model]
+    rating_sum = select(func.coalesce(func.sum(review_model.rating), 0.0)).where(foreign_key == model.id).scalar_subquery()
+    review_count = select(func.count()).select_from(review_model).where(foreign_key == model.id).scalar_subquery()
+    return rating_sum, review_count
+
+
+def _drifted(model):
+    rating_sum, review_count = _actual(model)
+    return or_(model.review_count != review_count, func.abs(model.rating_sum - rating_sum) > 1e-6)
+
+
+def check_ratings(connection) -> dict:
+    """Ids of the cafes and societies whose aggregates don't match their reviews"""
+    return {
+        model.__tablename__: connection.execute(select(model.id).where(_drifted(model)).order_by(model.id)).scalars().all()
+        for model in RATED
+    }
+
+
+def reconcile_ratings(connection) -> dict:
+    """Recompute drifted aggregates from the review tables; returns how many rows were repaired"""
+    repaired = {}
+    for model in RATED:
+        rating_sum, review_count = _actual(model)
+        values = {"rating_sum": rating_sum, "review_count": review_count}
+        if model is Cafe:
+            review_model, foreign_key = RATED[model]
+            values["rating"] = select(func.avg(review_model.rating)).where(foreign_key == model.id).scalar_subquery()
+        result = connection.execute(update(model).where(_drifted(model)).values(**values))
+        repaired[model.__tablename__] = result.rowcount
+    return repaired
+
+
+if __name__ == "__main__":
+    from database import get_engine
+    engine = get_engine()
+
+    parser = argparse.ArgumentParser(description="Check or repair the cafe and society rating aggregates")
+    parser.add_argument("command", choices=["check", "reconcile"])
+    args = parser.parse_args()
+
+    if args.command == "reconcile":
+        with engine.begin() as connection:
+            repaired = reconcile_ratings(connection)
+        print(*(f"{table}: {count} repaired" for table, count in repaired.items()), sep="\n")
+    else:
+        with engine.connect() as connection:
+            drifted = check_ratings(connection)
+        for table, ids in drifted.items():
+            print(f"{table}: {len(ids)} drifted", *(f"  #{entity_id}" for entity_id in ids[:20]), sep="\n")
+        if any(drifted.values()):
+            raise SystemExit(1)
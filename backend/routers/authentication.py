@@ -1,26 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.user import UserLogin
 from schemas.token import Token
 from authorization.auth_token import create_access_token
-from database import get_db
+from database import get_db, get_async_db
 from models.user import User
-from hashing import Hash  
+from hashing import Hash, HashPoolBusy, hash_password, verify_password
+from authorization.oauth2 import forget_user
+from rate_limit import TokenBuckets, client_ip
 
 router = APIRouter(tags=["authentication"])
 
+# Attempts per client IP, and per account whichever IPs they come from. Behind a
+# proxy, client IPs need FORWARDED_ALLOW_IPS (see rate_limit.py)
+login_ip_limits = TokenBuckets(
+    "login_ip",
+    burst=int(os.getenv("LOGIN_IP_BURST", "20")),
+    rate=float(os.getenv("LOGIN_IP_PER_MINUTE", "10")) / 60,
+)
+login_account_limits = TokenBuckets(
+    "login_account",
+    burst=int(os.getenv("LOGIN_ACCOUNT_BURST", "5")),
+    rate=float(os.getenv("LOGIN_ACCOUNT_PER_MINUTE", "2")) / 60,
+)
+
+# Async so a waiting login holds no threadpool thread; bcrypt itself runs on the
+# hash pool (see hashing.py), which answers 503 rather than queueing unboundedly
 @router.post("/login", response_model=Token)
-def login(request: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == request.username).first()
+async def login(http_request: Request, request: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    login_ip_limits.limit(client_ip(http_request))
+    login_account_limits.limit(request.username.lower())
+
+    db_user = (await db.execute(select(User).where(User.email == request.username))).scalars().first()
 
-    if db_user is None or not Hash.verify(request.password, db_user.password):
+    if db_user is None or not await verify_password(request.password, db_user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Raise the hash to the current cost while we have the plain password, so
+    # BCRYPT_ROUNDS increases reach every active account without password resets
+    if Hash.needs_rehash(db_user.password):
+        try:
+            db_user.password = await hash_password(request.password)
+        except HashPoolBusy:
+            pass  # Not worth failing the login over; the next one will rehash
+        else:
+            await db.commit()
+            forget_user(db_user.email)
+
     # Create the JWT token for the user
     access_token = create_access_token(data={"sub": db_user.email})
 
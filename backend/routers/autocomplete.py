@@ -0,0 +1,87 @@
+from enum import Enum
+import os
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select, union_all, func, or_, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from cache import TTLCache
+from database import get_async_read_db
+from models.product import Product
+from models.trip import Trip
+from models.event import Event
+from models.ride import Ride
+from query_budget import query_budget
+
+router = APIRouter(prefix="/autocomplete", tags=["autocomplete"])
+
+
+class SuggestionField(str, Enum):
+    LOCATION = "location"
+    TITLE = "title"
+
+
+# field -> free-text columns suggestions are drawn from; each has a trigram GIN
+# index (migration 2e7b9d4a6c81)
+SUGGESTION_COLUMNS = {
+    SuggestionField.LOCATION: [Ride.from_location, Ride.to_location, Product.pickup_location],
+    SuggestionField.TITLE: [Product.title, Trip.title, Event.title],
+}
+
+# Typeahead sends a request per keystroke and popular prefixes repeat across users
+suggestion_cache = TTLCache(
+    "autocomplete",
+    maxsize=int(os.getenv("AUTOCOMPLETE_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("AUTOCOMPLETE_CACHE_TTL", "60")),
+)
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def matching_values(column, q: str):
+    # "value %> q" is word similarity (q against the closest part of value), which suits
+    # partial input like "h12" vs "NUST H-12"; ILIKE catches exact substrings.
+    # Both are served by the column's gin_trgm_ops index.
+    return (
+        select(column.label("value"), func.word_similarity(q, column).label("score"))
+        .where(or_(column.bool_op("%>")(q), column.ilike(f"%{escape_like(q)}%", escape="\\")))
+    )
+
+def matching_values_without_trigrams(column, q: str):
+    # Fallback for databases without pg_trgm (SQLite in tests and benchmarks):
+    # substring matches only, prefixes first
+    q = escape_like(q)
+    return (
+        select(column.label("value"), case((column.ilike(f"{q}%", escape="\\"), 1.0), else_=0.5).label("score"))
+        .where(column.ilike(f"%{q}%", escape="\\"))
+    )
+
+# Suggest locations or listing titles for partial input
+@router.get("/", response_model=List[str], dependencies=[query_budget(1)])
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    field: SuggestionField = SuggestionField.LOCATION,
+    limit: int = Query(10, ge=1, le=25),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    # Trigram matching ignores case, so differently cased input shares a cache entry
+    q = " ".join(q.split()).lower()
+    key = (field, q, limit)
+    suggestions = suggestion_cache.get(key)
+    if suggestions is not None:
+        return suggestions
+
+    match = matching_values if db.get_bind().dialect.name == "postgresql" else matching_values_without_trigrams
+    matches = union_all(*(match(column, q) for column in SUGGESTION_COLUMNS[field])).subquery()
+    result = await db.execute(
+        select(matches.c.value)
+        .group_by(matches.c.value)
+        .order_by(func.max(matches.c.score).desc(), matches.c.value)
+        .limit(limit)
+    )
+    suggestions = result.scalars().all()
+    suggestion_cache.set(key, suggestions)
+    return suggestions
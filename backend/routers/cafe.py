@@ -1,72 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 
 from models.cafe import Cafe, Review
-from schemas.cafe import CafeCreate, CafeRead, CafeWithReviews, ReviewCreate, ReviewRead
-from database import get_db
+from schemas.cafe import CafeCreate, CafeRead, CafeWithReviews, ReviewCreate, ReviewRead, RankedCafe
+from database import get_db, get_read_db
+from ratings import average_rating, remove_review, upsert_review
+from leaderboard import leaderboards
+from pagination import ReviewPaginator
+from query_budget import query_budget
 from authorization.oauth2 import get_current_user  
 
 router = APIRouter(prefix="/cafes", tags=["cafes"])
 
 @router.get("/", response_model=List[CafeRead])
-def list_cafes(db: Session = Depends(get_db)):
+def list_cafes(db: Session = Depends(get_read_db)):
     """List all cafes"""
     return db.query(Cafe).all()
 
-# OPTIMIZED: Get cafes with ratings using only 2 queries (similar to societies logic)
+# Get cafes with ratings in a single scan, from the running aggregates
 @router.get("/with-reviews", response_model=List[dict])
-def get_cafes_with_reviews(db: Session = Depends(get_db)):
-    """Get all cafes with reviews and average ratings - OPTIMIZED VERSION"""
-    
-    # Query 1: Get all cafes
+def get_cafes_with_reviews(db: Session = Depends(get_read_db)):
+    """Get all cafes with their average rating and review count"""
     cafes = db.query(Cafe).all()
     
-    # Query 2: Get all ratings aggregated by cafe_id in a single query
-    ratings_query = (
-        db.query(
-            Review.cafe_id,
-            func.avg(Review.rating).label('avg_rating'),
-            func.count(Review.id).label('review_count')
-        )
-        .group_by(Review.cafe_id)
-        .all()
-    )
-    
-    # Create a lookup dictionary for O(1) access
-    ratings_dict = {
-        rating.cafe_id: {
-            'average_rating': round(float(rating.avg_rating), 2) if rating.avg_rating else 0.0,
-            'review_count': rating.review_count
-        }
-        for rating in ratings_query
-    }
-    
-    # Build the result with ratings
-    result = []
-    for cafe in cafes:
-        ratings_data = ratings_dict.get(cafe.id, {'average_rating': 0.0, 'review_count': 0})
-        
-        result.append({
+    return [
+        {
             "id": cafe.id,
             "name": cafe.name,
             "image_url": cafe.image_url,
             "location": getattr(cafe, "location", None),
             "description": getattr(cafe, "description", None),
-            "average_rating": ratings_data['average_rating'],
-            "review_count": ratings_data['review_count']
-        })
-    
-    return result
+            "average_rating": average_rating(cafe.rating_sum, cafe.review_count),
+            "review_count": cafe.review_count
+        }
+        for cafe in cafes
+    ]
+
+# Best rated cafes, answered from the in-memory leaderboard
+@router.get("/top", response_model=List[RankedCafe], dependencies=[query_budget(1)])
+def get_top_cafes(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_read_db)):
+    """Cafes ranked by Bayesian average rating, so a handful of reviews can't top the list"""
+    return leaderboards[Cafe].top(db, limit)
+
+def review_page(db: Session, cafe_id: int, page: ReviewPaginator):
+    # One page of a cafe's reviews, with each reviewer joined in the same query
+    query = db.query(Review).options(joinedload(Review.creator)).filter(Review.cafe_id == cafe_id)
+    return page.finish(page.apply(query, Review).all())
 
-@router.get("/{cafe_id}", response_model=CafeWithReviews)
-def get_cafe(cafe_id: int, db: Session = Depends(get_db)):
-    """Get a specific cafe with all its reviews"""
+@router.get("/{cafe_id}", response_model=CafeWithReviews, dependencies=[query_budget(2)])
+def get_cafe(cafe_id: int, db: Session = Depends(get_db), page: ReviewPaginator = Depends()):
+    """Get a specific cafe with its rating summary and the first page of its reviews"""
     cafe = db.query(Cafe).filter(Cafe.id == cafe_id).first()
     if not cafe:
         raise HTTPException(status_code=404, detail="Cafe not found")
-    return cafe
+    reviews = review_page(db, cafe_id, page)
+    return {
+        **CafeRead.model_validate(cafe).model_dump(),
+        "average_rating": average_rating(cafe.rating_sum, cafe.review_count),
+        "review_count": cafe.review_count,
+        "reviews": reviews,
+        "next_cursor": page.next_cursor,
+    }
+
+@router.get("/{cafe_id}/reviews", response_model=List[ReviewRead], dependencies=[query_budget(1)])
+def get_cafe_reviews(cafe_id: int, db: Session = Depends(get_read_db), page: ReviewPaginator = Depends()):
+    """Get a page of a cafe's reviews, newest first or with ?sort=rating"""
+    return review_page(db, cafe_id, page)
 
 @router.post("/", response_model=CafeRead, status_code=status.HTTP_201_CREATED)
 def create_cafe(cafe: CafeCreate, db: Session = Depends(get_db)):
@@ -81,27 +81,21 @@ def create_cafe(cafe: CafeCreate, db: Session = Depends(get_db)):
 def create_review(
     cafe_id: int,
     review: ReviewCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    """Create a review for a cafe"""
-    cafe = db.query(Cafe).filter(Cafe.id == cafe_id).first()
-    if not cafe:
+    """Create a review for a cafe, or replace the user's existing one (one review per user and cafe)"""
+    result = upsert_review(db, Cafe, cafe_id, current_user.id, review.rating, review.comment)
+    if result is None:
         raise HTTPException(status_code=404, detail="Cafe not found")
-    
-    # Check if user already reviewed this cafe
-    existing_review = db.query(Review).filter(
-        Review.cafe_id == cafe_id,
-        Review.user_id == current_user.id
-    ).first()
-    if existing_review:
-        raise HTTPException(status_code=400, detail="You can only submit one review per cafe")
-    
-    db_review = Review(**review.dict(), user_id=current_user.id, cafe_id=cafe_id)
-    db.add(db_review)
     db.commit()
-    db.refresh(db_review)
-    return db_review
+    
+    row, created, totals = result
+    leaderboards[Cafe].update(cafe_id, *totals)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return {**row._mapping, "creator": current_user}
 
 @router.delete("/{cafe_id}/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_review(
@@ -117,8 +111,10 @@ def delete_review(
     if review.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this review")
     
-    db.delete(review)
+    totals = remove_review(db, Cafe, review)
     db.commit()
+    if totals is not None:
+        leaderboards[Cafe].update(review.cafe_id, *totals)
     return
 
 @router.get("/{cafe_id}/average-rating")
@@ -128,11 +124,8 @@ def get_average_rating(cafe_id: int, db: Session = Depends(get_db)):
     if not cafe:
         raise HTTPException(status_code=404, detail="Cafe not found")
     
-    avg_rating = db.query(func.avg(Review.rating)).filter(Review.cafe_id == cafe_id).scalar()
-    review_count = db.query(func.count(Review.id)).filter(Review.cafe_id == cafe_id).scalar()
-    
     return {
         "cafe_id": cafe_id,
-        "average_rating": round(avg_rating, 2) if avg_rating else 0,
-        "review_count": review_count
+        "average_rating": average_rating(cafe.rating_sum, cafe.review_count),
+        "review_count": cafe.review_count
     }
\ No newline at end of file
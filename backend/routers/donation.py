@@ -1,14 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
 from models.donation import Donation
 from models.user import User
 from schemas.donation import DonationCreate, DonationUpdate, DonationResponse
 from database import get_db
 from authorization.oauth2 import get_current_user
+from pagination import Paginator
+from query_budget import query_budget
 
 router = APIRouter(prefix="/donations", tags=["donations"])
 
+
+class DonationPaginator(Paginator):
+    """The donations list keeps its smaller default page of 10"""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = None,
+        limit: int = Query(10, ge=1),
+        skip: Optional[int] = Query(None, include_in_schema=False),
+    ):
+        super().__init__(request, response, cursor, limit, skip)
+
+
 # Create a Donation
 @router.post("/", response_model=DonationResponse, status_code=status.HTTP_201_CREATED)
 def create_donation(
@@ -41,30 +58,28 @@ def create_donation(
     return db_donation
 
 # Get all donations
-@router.get("/", response_model=List[DonationResponse])
+@router.get("/", response_model=List[DonationResponse], dependencies=[query_budget(2)])
 def get_all_donations(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 10
+    page: DonationPaginator = Depends()
 ):
-    donations = db.query(Donation).offset(skip).limit(limit).all()
+    donations = page.finish(page.apply(db.query(Donation).options(selectinload(Donation.images), joinedload(Donation.creator)), Donation).all())
     return donations
 
 # Get current user's donations
-@router.get("/me", response_model=List[DonationResponse])
+@router.get("/me", response_model=List[DonationResponse], dependencies=[query_budget(3)])
 def get_my_donations(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    donations = db.query(Donation).filter(Donation.creator_id == current_user.id).offset(skip).limit(limit).all()
+    donations = page.finish(page.apply(db.query(Donation).options(selectinload(Donation.images), joinedload(Donation.creator)).filter(Donation.creator_id == current_user.id), Donation).all())
     return donations
 
 # Get a single donation by ID
-@router.get("/{donation_id}", response_model=DonationResponse)
+@router.get("/{donation_id}", response_model=DonationResponse, dependencies=[query_budget(2)])
 def get_donation(donation_id: int, db: Session = Depends(get_db)):
-    donation = db.query(Donation).filter(Donation.id == donation_id).first()
+    donation = db.query(Donation).options(selectinload(Donation.images), joinedload(Donation.creator)).filter(Donation.id == donation_id).first()
     if not donation:
         raise HTTPException(status_code=404, detail="Donation not found")
     return donation
@@ -102,12 +117,8 @@ def update_donation(
 
     if donation.image_paths is not None:
         from models.donation import DonationImage
-        # Delete existing images
-        db.query(DonationImage).filter(DonationImage.donation_id == donation_id).delete()
-        # Add new images
-        for image_path in donation.image_paths:
-            db_image = DonationImage(image_path=image_path, donation_id=donation_id)
-            db.add(db_image)
+        # Replacing the collection deletes the old images (delete-orphan)
+        db_donation.images = [DonationImage(image_path=image_path) for image_path in donation.image_paths]
 
     db.commit()
     db.refresh(db_donation)
@@ -1,14 +1,39 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
 from models.event import Event, EventImage
 from models.user import User
 from schemas.event import EventCreate, EventResponse, EventUpdate
 from database import get_db
 from authorization.oauth2 import get_current_user
+from pagination import Paginator
+from query_budget import query_budget
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+
+# Query parameters for the event list endpoint
+class EventFilters:
+    def __init__(
+        self,
+        society: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ):
+        self.society = society
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def apply(self, query):
+        if self.society is not None:
+            query = query.filter(Event.society == self.society)
+        if self.date_from is not None:
+            query = query.filter(Event.event_date >= self.date_from)
+        if self.date_to is not None:
+            query = query.filter(Event.event_date <= self.date_to)
+        return query
+
 # Create an Event
 @router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 def create_event(
@@ -46,30 +71,29 @@ def create_event(
     return db_event
 
 # Get all events
-@router.get("/", response_model=List[EventResponse])
+@router.get("/", response_model=List[EventResponse], dependencies=[query_budget(2)])
 def get_all_events(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    filters: EventFilters = Depends(),
+    page: Paginator = Depends()
 ):
-    events = db.query(Event).offset(skip).limit(limit).all()
+    events = page.finish(page.apply(filters.apply(db.query(Event).options(selectinload(Event.images), joinedload(Event.creator))), Event).all())
     return events
 
 # Get current user's events
-@router.get("/me", response_model=List[EventResponse])
+@router.get("/me", response_model=List[EventResponse], dependencies=[query_budget(3)])
 def get_my_events(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    events = db.query(Event).filter(Event.creator_id == current_user.id).offset(skip).limit(limit).all()
+    events = page.finish(page.apply(db.query(Event).options(selectinload(Event.images), joinedload(Event.creator)).filter(Event.creator_id == current_user.id), Event).all())
     return events
 
 # Get a single event by ID
-@router.get("/{event_id}", response_model=EventResponse)
+@router.get("/{event_id}", response_model=EventResponse, dependencies=[query_budget(2)])
 def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = db.query(Event).options(selectinload(Event.images), joinedload(Event.creator)).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+
+from cache import get_cache_stats
+from database import get_pool_stats
+from hashing import hash_pool
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/db-pool")
+def db_pool_stats():
+    """Connection pool usage, for sizing DB_POOL_SIZE / DB_MAX_OVERFLOW"""
+    return get_pool_stats()
+
+
+@router.get("/caches")
+def cache_stats():
+    """Size and hit/miss counters of this worker's in-process caches"""
+    return get_cache_stats()
+
+
+@router.get("/hash-pool")
+def hash_pool_stats():
+    """bcrypt pool usage, for sizing HASH_WORKERS / HASH_QUEUE_LIMIT"""
+    return hash_pool.stats()
@@ -1,15 +1,50 @@
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from models.lost_found import LostFoundItem, ItemStatus
+from sqlalchemy import func, or_, case
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+from models.lost_found import LostFoundItem, LostFoundMatch, ItemStatus, ItemType
 from models.user import User
-from schemas.lost_found import LostFoundItemCreate, LostFoundItemResponse
-from database import get_db
+from schemas.lost_found import LostFoundItemCreate, LostFoundItemResponse, LostFoundMatchResponse, LostFoundFacets
+from database import get_db, get_read_db
 from authorization.oauth2 import get_current_user
+from pagination import Paginator
+from query_budget import query_budget
+from matching import record_matches
 
 router = APIRouter(prefix="/lost-found", tags=["lost-found"])
 
 
+# Query parameters shared by the item list and facet endpoints
+class LostFoundFilters:
+    def __init__(
+        self,
+        category: Optional[str] = None,
+        type: Optional[ItemType] = None,
+        status: Optional[ItemStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ):
+        self.category = category
+        self.type = type
+        self.status = status
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def apply(self, query):
+        if self.category is not None:
+            query = query.filter(LostFoundItem.category == self.category)
+        if self.type is not None:
+            query = query.filter(LostFoundItem.type == self.type)
+        if self.status is not None:
+            query = query.filter(LostFoundItem.status == self.status)
+        if self.date_from is not None:
+            query = query.filter(LostFoundItem.date >= self.date_from)
+        if self.date_to is not None:
+            query = query.filter(LostFoundItem.date <= self.date_to)
+        return query
+
+
 @router.post("/", response_model=LostFoundItemResponse, status_code=status.HTTP_201_CREATED)
 def create_lost_found_item(
     item: LostFoundItemCreate,
@@ -33,32 +68,56 @@ def create_lost_found_item(
     )
     
     db.add(db_item)
+    db.flush()
+    # Pair it with existing items of the opposite type, in the same transaction
+    record_matches(db, db_item)
     db.commit()
     db.refresh(db_item)
     
     return db_item
 
 
-@router.get("/", response_model=List[LostFoundItemResponse])
-def get_all_items(db: Session = Depends(get_db)):
-    items = db.query(LostFoundItem).all()
+@router.get("/", response_model=List[LostFoundItemResponse], dependencies=[query_budget(1)])
+def get_all_items(
+    db: Session = Depends(get_read_db),
+    filters: LostFoundFilters = Depends(),
+    page: Paginator = Depends()
+):
+    items = page.finish(page.apply(filters.apply(db.query(LostFoundItem).options(joinedload(LostFoundItem.creator))), LostFoundItem).all())
     return items
 
+# Count matching items per category, type and status
+@router.get("/facets", response_model=LostFoundFacets, dependencies=[query_budget(1)])
+def get_facets(
+    db: Session = Depends(get_read_db),
+    filters: LostFoundFilters = Depends()
+):
+    # One grouped query over (category, type, status), rolled up per facet here
+    rows = (
+        filters.apply(db.query(LostFoundItem.category, LostFoundItem.type, LostFoundItem.status, func.count()))
+        .group_by(LostFoundItem.category, LostFoundItem.type, LostFoundItem.status)
+        .all()
+    )
+    facets = {"category": {}, "type": {}, "status": {}}
+    for category, item_type, item_status, count in rows:
+        for facet, value in (("category", category), ("type", item_type.value), ("status", item_status.value)):
+            facets[facet][value] = facets[facet].get(value, 0) + count
+    return facets
+
 # Get current user's lost and found items
-@router.get("/me", response_model=List[LostFoundItemResponse])
+@router.get("/me", response_model=List[LostFoundItemResponse], dependencies=[query_budget(2)])
 def get_my_items(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    items = db.query(LostFoundItem).filter(LostFoundItem.creator_id == current_user.id).offset(skip).limit(limit).all()
+    items = page.finish(page.apply(db.query(LostFoundItem).options(joinedload(LostFoundItem.creator)).filter(LostFoundItem.creator_id == current_user.id), LostFoundItem).all())
     return items
 
 
-@router.get("/{item_id}", response_model=LostFoundItemResponse)
+@router.get("/{item_id}", response_model=LostFoundItemResponse, dependencies=[query_budget(1)])
 def get_item(item_id: int, db: Session = Depends(get_db)):
-    item = db.query(LostFoundItem).filter(LostFoundItem.id == item_id).first()
+    item = db.query(LostFoundItem).options(joinedload(LostFoundItem.creator)).filter(LostFoundItem.id == item_id).first()
     
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -66,6 +125,30 @@ def get_item(item_id: int, db: Session = Depends(get_db)):
     return item
 
 
+# Items of the opposite type that may be the same object, best first
+@router.get("/{item_id}/matches", response_model=List[LostFoundMatchResponse], dependencies=[query_budget(2)])
+def get_item_matches(item_id: int, db: Session = Depends(get_read_db)):
+    if not db.query(LostFoundItem.id).filter(LostFoundItem.id == item_id).first():
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    other_id = case(
+        (LostFoundMatch.lost_item_id == item_id, LostFoundMatch.found_item_id),
+        else_=LostFoundMatch.lost_item_id,
+    )
+    rows = (
+        db.query(LostFoundItem, LostFoundMatch.score)
+        .join(LostFoundMatch, LostFoundItem.id == other_id)
+        .options(joinedload(LostFoundItem.creator))
+        .filter(
+            or_(LostFoundMatch.lost_item_id == item_id, LostFoundMatch.found_item_id == item_id),
+            LostFoundItem.status != ItemStatus.CLAIMED,
+        )
+        .order_by(LostFoundMatch.score.desc(), LostFoundItem.id)
+        .all()
+    )
+    return [{"score": score, "item": item} for item, score in rows]
+
+
 @router.patch("/{item_id}/claim", response_model=LostFoundItemResponse)
 def claim_item(
     item_id: int,
@@ -111,6 +194,8 @@ def update_item(
     item.type = item_update.type
     item.status = ItemStatus.LOST if item_update.type == "lost" else ItemStatus.FOUND
     
+    db.flush()
+    record_matches(db, item)
     db.commit()
     db.refresh(item)
     
@@ -1,14 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from models.product import Product, ProductImage
 from models.user import User
-from schemas.product import ProductCreate, ProductResponse, ProductUpdate
-from database import get_db
+from schemas.product import ProductCreate, ProductResponse, ProductUpdate, ProductFacets
+from database import get_db, get_async_read_db
 from authorization.oauth2 import get_current_user
+from pagination import Paginator
+from query_budget import query_budget
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+
+# Query parameters shared by the product list and facet endpoints
+class ProductFilters:
+    def __init__(
+        self,
+        category: Optional[str] = None,
+        condition: Optional[str] = None,
+        min_price: Optional[float] = Query(None, ge=0),
+        max_price: Optional[float] = Query(None, ge=0),
+    ):
+        self.category = category
+        self.condition = condition
+        self.min_price = min_price
+        self.max_price = max_price
+
+    def apply(self, query):
+        if self.category is not None:
+            query = query.filter(Product.category == self.category)
+        if self.condition is not None:
+            query = query.filter(Product.condition == self.condition)
+        if self.min_price is not None:
+            query = query.filter(Product.price >= self.min_price)
+        if self.max_price is not None:
+            query = query.filter(Product.price <= self.max_price)
+        return query
+
+
 # Create a Product
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 def create_product(
@@ -47,30 +78,52 @@ def create_product(
     return db_product
 
 # Get all products
-@router.get("/", response_model=List[ProductResponse])
-def get_all_products(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+@router.get("/", response_model=List[ProductResponse], dependencies=[query_budget(2)])
+async def get_all_products(
+    db: AsyncSession = Depends(get_async_read_db),
+    filters: ProductFilters = Depends(),
+    page: Paginator = Depends()
 ):
-    products = db.query(Product).offset(skip).limit(limit).all()
-    return products
+    result = await db.execute(
+        page.apply(
+            filters.apply(select(Product).options(selectinload(Product.images), joinedload(Product.creator))),
+            Product
+        )
+    )
+    return page.finish(result.scalars().all())
+
+# Count matching products per category and per condition
+@router.get("/facets", response_model=ProductFacets, dependencies=[query_budget(1)])
+async def get_product_facets(
+    db: AsyncSession = Depends(get_async_read_db),
+    filters: ProductFilters = Depends()
+):
+    # One grouped query over (category, condition), rolled up per facet here
+    result = await db.execute(
+        filters.apply(
+            select(Product.category, Product.condition, func.count().label("count"))
+        ).group_by(Product.category, Product.condition)
+    )
+    facets = {"category": {}, "condition": {}}
+    for category, condition, count in result:
+        facets["category"][category] = facets["category"].get(category, 0) + count
+        facets["condition"][condition] = facets["condition"].get(condition, 0) + count
+    return facets
 
 # Get current user's products
-@router.get("/me", response_model=List[ProductResponse])
+@router.get("/me", response_model=List[ProductResponse], dependencies=[query_budget(3)])
 def get_my_products(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    products = db.query(Product).filter(Product.creator_id == current_user.id).offset(skip).limit(limit).all()
+    products = page.finish(page.apply(db.query(Product).options(selectinload(Product.images), joinedload(Product.creator)).filter(Product.creator_id == current_user.id), Product).all())
     return products
 
 # Get a single product by ID
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.get("/{product_id}", response_model=ProductResponse, dependencies=[query_budget(2)])
 def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.query(Product).options(selectinload(Product.images), joinedload(Product.creator)).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
@@ -109,18 +162,12 @@ def update_product(
     if product.contact_number is not None:
         db_product.contact_number = product.contact_number
     
-    # Update images - delete old ones and add new ones
+    # Update images - replacing the collection deletes the old ones (delete-orphan)
     if product.image_paths is not None:
-        # Delete existing images
-        db.query(ProductImage).filter(ProductImage.product_id == product_id).delete()
-        
-        # Add new images
-        for image_path in product.image_paths:
-            db_image = ProductImage(
-                image_path=image_path,
-                product_id=db_product.id
-            )
-            db.add(db_image)
+        db_product.images = [
+            ProductImage(image_path=image_path)
+            for image_path in product.image_paths
+        ]
     
     db.commit()
     db.refresh(db_product)
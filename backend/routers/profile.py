@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import get_db
+from database import get_async_db
 from models.user import User
 from models.product import Product
 from models.trip import Trip
@@ -10,41 +12,53 @@ from models.event import Event
 from models.lost_found import LostFoundItem
 from models.ride import Ride
 from schemas.profile import UserProfileResponse, ProfileStats
-from authorization.oauth2 import get_current_user
+from authorization.oauth2 import get_current_user_async
+from query_budget import query_budget
 
 router = APIRouter(prefix="/users/me/profile", tags=["profile"])
 
-@router.get("/", response_model=UserProfileResponse)
-def get_user_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+# user + counts + six recent lists + their four image collections
+@router.get("/", response_model=UserProfileResponse, dependencies=[query_budget(12)])
+async def get_user_profile(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Get counts
-    product_count = db.query(Product).filter(Product.creator_id == current_user.id).count()
-    trip_count = db.query(Trip).filter(Trip.creator_id == current_user.id).count()
-    ride_count = db.query(Ride).filter(Ride.requester_id == current_user.id).count()
-    donation_count = db.query(Donation).filter(Donation.creator_id == current_user.id).count()
-    event_count = db.query(Event).filter(Event.creator_id == current_user.id).count()
-    lost_found_count = db.query(LostFoundItem).filter(LostFoundItem.creator_id == current_user.id).count()
+    def count_of(model, owner_column):
+        return select(func.count()).select_from(model).where(owner_column == current_user.id).scalar_subquery()
 
-    # Get recent items (last 5)
-    recent_products = db.query(Product).filter(Product.creator_id == current_user.id).order_by(Product.created_at.desc()).limit(5).all()
-    recent_trips = db.query(Trip).filter(Trip.creator_id == current_user.id).order_by(Trip.created_at.desc()).limit(5).all()
-    recent_rides = db.query(Ride).filter(Ride.requester_id == current_user.id).order_by(Ride.created_at.desc()).limit(5).all()
-    recent_donations = db.query(Donation).filter(Donation.creator_id == current_user.id).order_by(Donation.created_at.desc()).limit(5).all()
-    recent_events = db.query(Event).filter(Event.creator_id == current_user.id).order_by(Event.created_at.desc()).limit(5).all()
-    recent_lost_found = db.query(LostFoundItem).filter(LostFoundItem.creator_id == current_user.id).order_by(LostFoundItem.created_at.desc()).limit(5).all()
+    # Get all counts in a single round trip
+    counts = (await db.execute(
+        select(
+            count_of(Product, Product.creator_id).label("product_count"),
+            count_of(Trip, Trip.creator_id).label("trip_count"),
+            count_of(Ride, Ride.requester_id).label("ride_count"),
+            count_of(Donation, Donation.creator_id).label("donation_count"),
+            count_of(Event, Event.creator_id).label("event_count"),
+            count_of(LostFoundItem, LostFoundItem.creator_id).label("lost_found_count"),
+        )
+    )).one()
+
+    # Get recent items (last 5), eager loading what the response models read
+    async def recent(model, owner_column, *options):
+        result = await db.execute(
+            select(model)
+            .options(*options)
+            .where(owner_column == current_user.id)
+            .order_by(model.created_at.desc())
+            .limit(5)
+        )
+        return result.scalars().all()
+
+    recent_products = await recent(Product, Product.creator_id, selectinload(Product.images), joinedload(Product.creator))
+    recent_trips = await recent(Trip, Trip.creator_id, selectinload(Trip.images), joinedload(Trip.creator))
+    recent_rides = await recent(Ride, Ride.requester_id, joinedload(Ride.requester))
+    recent_donations = await recent(Donation, Donation.creator_id, selectinload(Donation.images), joinedload(Donation.creator))
+    recent_events = await recent(Event, Event.creator_id, selectinload(Event.images), joinedload(Event.creator))
+    recent_lost_found = await recent(LostFoundItem, LostFoundItem.creator_id, joinedload(LostFoundItem.creator))
 
     return {
         "user": current_user,
-        "stats": {
-            "product_count": product_count,
-            "trip_count": trip_count,
-            "ride_count": ride_count,
-            "donation_count": donation_count,
-            "event_count": event_count,
-            "lost_found_count": lost_found_count,
-        },
+        "stats": counts._asdict(),
         "recent_products": recent_products,
         "recent_trips": recent_trips,
         "recent_rides": recent_rides,
@@ -1,14 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from itertools import islice
+import heapq
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 from models.ride import Ride
 from models.user import User
-from schemas.ride import RideCreate, RideResponse, RideUpdate
-from database import get_db
+from schemas.ride import RideCreate, RideResponse, RideUpdate, RideMatch
+from database import get_db, get_read_db
 from authorization.oauth2 import get_current_user
+from pagination import Paginator
+from query_budget import query_budget
 
 router = APIRouter(prefix="/rides", tags=["rides"])
 
+# Rides are entered as a local date and wall-clock time
+RIDE_TIMEZONE = ZoneInfo(os.getenv("RIDE_TIMEZONE", "Asia/Karachi"))
+RIDE_TIME_FORMATS = ["%H:%M", "%H:%M:%S", "%I:%M %p"]
+
+
+def parse_departure(ride_date: str, ride_time: str) -> Optional[datetime]:
+    """ride_date (YYYY-MM-DD) and ride_time in RIDE_TIMEZONE as a UTC instant, or None if they don't parse"""
+    for time_format in RIDE_TIME_FORMATS:
+        try:
+            local = datetime.strptime(f"{ride_date.strip()[:10]} {ride_time.strip()}", f"%Y-%m-%d {time_format}")
+        except ValueError:
+            continue
+        return local.replace(tzinfo=RIDE_TIMEZONE).astimezone(timezone.utc)
+    return None
+
+
+def as_utc(value: datetime) -> datetime:
+    # Naive values are local ride times from clients, or UTC read back from SQLite
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
 
 # Create a Ride Request
 @router.post("/", response_model=RideResponse, status_code=status.HTTP_201_CREATED)
@@ -22,6 +49,7 @@ def create_ride(
         to_location=ride.to_location,
         ride_date=ride.ride_date,
         ride_time=ride.ride_time,
+        departure_at=parse_departure(ride.ride_date, ride.ride_time),
         contact=ride.contact,
         requester_id=current_user.id
     )
@@ -34,30 +62,74 @@ def create_ride(
 
 
 # Get all ride requests
-@router.get("/", response_model=List[RideResponse])
+@router.get("/", response_model=List[RideResponse], dependencies=[query_budget(1)])
 def get_all_rides(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    rides = db.query(Ride).options(joinedload(Ride.requester)).offset(skip).limit(limit).all()
+    rides = page.finish(page.apply(db.query(Ride).options(joinedload(Ride.requester)), Ride).all())
     return rides
 
 
 # Get current user's ride requests
-@router.get("/me", response_model=List[RideResponse])
+@router.get("/me", response_model=List[RideResponse], dependencies=[query_budget(2)])
 def get_my_rides(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    rides = db.query(Ride).options(joinedload(Ride.requester)).filter(Ride.requester_id == current_user.id).offset(skip).limit(limit).all()
+    rides = page.finish(page.apply(db.query(Ride).options(joinedload(Ride.requester)).filter(Ride.requester_id == current_user.id), Ride).all())
     return rides
 
 
+# Find rides on the same route departing close to a given time
+@router.get("/match", response_model=List[RideMatch], dependencies=[query_budget(2)])
+def match_rides(
+    from_location: str,
+    to_location: str,
+    departure_at: datetime,
+    window_minutes: int = Query(60, ge=1, le=24 * 60),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    if departure_at.tzinfo is None:
+        departure_at = departure_at.replace(tzinfo=RIDE_TIMEZONE)
+    departure_at = departure_at.astimezone(timezone.utc)
+    window = timedelta(minutes=window_minutes)
+
+    # Walk the (from, to, departure_at) index outwards from the requested time in
+    # both directions; each side is already in order of time distance, so the
+    # closest rides are a merge of the two and never more than 2 * limit rows are read
+    route = (
+        db.query(Ride)
+        .options(joinedload(Ride.requester))
+        .filter(Ride.from_location == from_location, Ride.to_location == to_location)
+    )
+    later = (
+        route.filter(Ride.departure_at >= departure_at, Ride.departure_at <= departure_at + window)
+        .order_by(Ride.departure_at, Ride.id)
+        .limit(limit)
+        .all()
+    )
+    earlier = (
+        route.filter(Ride.departure_at < departure_at, Ride.departure_at >= departure_at - window)
+        .order_by(Ride.departure_at.desc(), Ride.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    def distance(ride):
+        return abs(as_utc(ride.departure_at) - departure_at)
+
+    closest = islice(heapq.merge(later, earlier, key=distance), limit)
+    return [
+        RideMatch(**RideResponse.model_validate(ride).model_dump(), minutes_apart=distance(ride).total_seconds() / 60)
+        for ride in closest
+    ]
+
+
 # Get a single ride request by ID
-@router.get("/{ride_id}", response_model=RideResponse)
+@router.get("/{ride_id}", response_model=RideResponse, dependencies=[query_budget(1)])
 def get_ride(ride_id: int, db: Session = Depends(get_db)):
     ride = db.query(Ride).options(joinedload(Ride.requester)).filter(Ride.id == ride_id).first()
     if not ride:
@@ -93,6 +165,8 @@ def update_ride(
         db_ride.ride_time = ride.ride_time
     if ride.contact is not None:
         db_ride.contact = ride.contact
+    if ride.ride_date is not None or ride.ride_time is not None:
+        db_ride.departure_at = parse_departure(db_ride.ride_date, db_ride.ride_time)
     
     db.commit()
     db.refresh(db_ride)
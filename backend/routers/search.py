@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, union_all, func, literal, literal_column, case, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from database import get_async_read_db
+from schemas.search import SearchResult
+from models.product import Product
+from models.trip import Trip
+from models.event import Event
+from models.donation import Donation
+from models.lost_found import LostFoundItem
+from query_budget import query_budget
+from routers.autocomplete import escape_like
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_CONFIG = "english"
+
+# search type -> post model; each table has a generated, GIN indexed search_vector
+# column (title weighted A, description B) that is created by migration 9c4f2b7e1d35
+SEARCH_SOURCES = {
+    "product": Product,
+    "trip": Trip,
+    "event": Event,
+    "donation": Donation,
+    "lost_found": LostFoundItem,
+}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=10, MaxFragments=2"
+
+# Snippets are HTML: the <mark> tags around matches are the only markup in them
+HTML_ESCAPES = [("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;")]
+
+
+def html_escape(text):
+    # SQL counterpart of html.escape, applied to user text before any markup is added.
+    # The text search parser reads &amp; and friends as entities, not words, so
+    # ts_headline still finds and highlights the same terms.
+    for char, entity in HTML_ESCAPES:
+        text = func.replace(text, char, entity)
+    return text
+
+
+def search_vector(model):
+    return literal_column(f"{model.__tablename__}.search_vector", TSVECTOR)
+
+
+def ranked_matches(type_, model, tsquery, per_type: int):
+    # Top matches of one table, served by its search_vector GIN index
+    rank = func.ts_rank(search_vector(model), tsquery)
+    return (
+        select(
+            literal(type_).label("type"),
+            model.id.label("id"),
+            model.title.label("title"),
+            model.description.label("description"),
+            rank.label("rank"),
+            model.created_at.label("created_at"),
+        )
+        .where(search_vector(model).bool_op("@@")(tsquery))
+        .order_by(rank.desc(), model.id.desc())
+        .limit(per_type)
+    )
+
+
+def substring_matches(type_, model, q: str, per_type: int):
+    # Fallback for databases without full-text search (SQLite in tests and
+    # benchmarks): case-insensitive substring match, title hits ranked first
+    pattern = f"%{escape_like(q)}%"
+    title_match = model.title.ilike(pattern, escape="\\")
+    rank = case((title_match, 1.0), else_=0.5)
+    top = (
+        select(
+            literal(type_).label("type"),
+            model.id.label("id"),
+            model.title.label("title"),
+            html_escape(func.coalesce(func.substr(model.description, 1, 200), "")).label("snippet"),
+            rank.label("rank"),
+            model.created_at.label("created_at"),
+        )
+        .where(or_(title_match, model.description.ilike(pattern, escape="\\")))
+        .order_by(rank.desc(), model.id.desc())
+        .limit(per_type)
+        .subquery()
+    )
+    # SQLite only accepts ORDER BY and LIMIT on a UNION member inside a subquery
+    return select(top)
+
+# Search all post types at once
+@router.get("/", response_model=List[SearchResult], dependencies=[query_budget(1)])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[List[str]] = Query(None),
+    limit: int = Query(5, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    if type:
+        unknown = set(type) - SEARCH_SOURCES.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown post type: {', '.join(sorted(unknown))}")
+    sources = [(type_, model) for type_, model in SEARCH_SOURCES.items() if not type or type_ in type]
+
+    if db.get_bind().dialect.name != "postgresql":
+        matches = union_all(*(substring_matches(type_, model, q, limit) for type_, model in sources)).subquery()
+        result = await db.execute(select(matches).order_by(matches.c.rank.desc(), matches.c.created_at.desc()))
+        return result.all()
+
+    # websearch_to_tsquery accepts free text ("quotes", or, -exclusions) without raising on syntax
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    matches = union_all(*(ranked_matches(type_, model, tsquery, limit) for type_, model in sources)).subquery()
+
+    # Snippets are only built for the rows that survived the per-type limits
+    result = await db.execute(
+        select(
+            matches.c.type,
+            matches.c.id,
+            matches.c.title,
+            func.ts_headline(SEARCH_CONFIG, html_escape(matches.c.description), tsquery, HEADLINE_OPTIONS).label("snippet"),
+            matches.c.rank,
+            matches.c.created_at,
+        )
+        .order_by(matches.c.rank.desc(), matches.c.created_at.desc())
+    )
+    return result.all()
@@ -1,7 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 from typing import List
-from sqlalchemy import func
 from models.society import Society, SocietyReview
 from models.user import User
 from schemas.society import (
@@ -9,9 +8,14 @@ from schemas.society import (
     SocietyResponse, 
     SocietyUpdate, 
     SocietyReviewCreate, 
-    SocietyReviewResponse
+    SocietyReviewResponse,
+    RankedSociety
 )
-from database import get_db
+from database import get_db, get_read_db
+from ratings import average_rating, remove_review, upsert_review
+from leaderboard import leaderboards
+from pagination import ReviewPaginator
+from query_budget import query_budget
 from authorization.oauth2 import get_current_user
 
 router = APIRouter(prefix="/societies", tags=["societies"])
@@ -31,87 +35,47 @@ def create_society(society: SocietyCreate, db: Session = Depends(get_db), curren
     return db_society
 
 @router.get("/", response_model=List[SocietyResponse])
-def get_societies(db: Session = Depends(get_db)):
+def get_societies(db: Session = Depends(get_read_db)):
     return db.query(Society).all()
 
-# OPTIMIZED: Get societies with ratings using only 2 queries
+# Get societies with ratings in a single scan, from the running aggregates
 @router.get("/with-reviews", response_model=List[dict])
-def get_societies_with_reviews(db: Session = Depends(get_db)):
-    """Get all societies with reviews and average ratings - OPTIMIZED VERSION"""
+def get_societies_with_reviews(db: Session = Depends(get_read_db)):
+    """Get all societies with their average rating and review count"""
+    rows = db.query(
+        Society.id,
+        Society.name,
+        Society.instagram_url,
+        Society.image_url,
+        Society.rating_sum,
+        Society.review_count
+    ).all()
     
-    # Query 1: Get all societies
-    societies = db.query(Society).all()
-    
-    # Query 2: Get all ratings aggregated by society_id in a single query
-    ratings_query = (
-        db.query(
-            SocietyReview.society_id,
-            func.avg(SocietyReview.rating).label('avg_rating'),
-            func.count(SocietyReview.id).label('review_count')
-        )
-        .group_by(SocietyReview.society_id)
-        .all()
-    )
-    
-    # Create a lookup dictionary for O(1) access
-    ratings_dict = {
-        rating.society_id: {
-            'average_rating': round(float(rating.avg_rating), 2),
-            'review_count': rating.review_count
-        }
-        for rating in ratings_query
-    }
-    
-    # Build the result with ratings
-    result = []
-    for society in societies:
-        ratings_data = ratings_dict.get(society.id, {'average_rating': 0.0, 'review_count': 0})
-        
-        result.append({
-            "id": society.id,
-            "name": society.name,
-            "instagram_url": society.instagram_url,
-            "image_url": society.image_url,
-            "average_rating": ratings_data['average_rating'],
-            "review_count": ratings_data['review_count']
-        })
-    
-    return result
-
-
-# ALTERNATIVE: Even more optimized with a single query using LEFT JOIN
-@router.get("/with-reviews-single-query", response_model=List[dict])
-def get_societies_with_reviews_single_query(db: Session = Depends(get_db)):
-    """Get all societies with ratings using a single optimized query"""
-    
-    # Single query with LEFT JOIN and aggregation
-    query = (
-        db.query(
-            Society.id,
-            Society.name,
-            Society.instagram_url,
-            Society.image_url,
-            func.coalesce(func.avg(SocietyReview.rating), 0).label('avg_rating'),
-            func.count(SocietyReview.id).label('review_count')
-        )
-        .outerjoin(SocietyReview, Society.id == SocietyReview.society_id)
-        .group_by(Society.id, Society.name, Society.instagram_url, Society.image_url)
-        .all()
-    )
-    
-    result = [
+    return [
         {
             "id": row.id,
             "name": row.name,
             "instagram_url": row.instagram_url,
             "image_url": row.image_url,
-            "average_rating": round(float(row.avg_rating), 2),
+            "average_rating": average_rating(row.rating_sum, row.review_count),
             "review_count": row.review_count
         }
-        for row in query
+        for row in rows
     ]
-    
-    return result
+
+
+# Kept for existing clients; the aggregates make it the same scan as /with-reviews
+@router.get("/with-reviews-single-query", response_model=List[dict])
+def get_societies_with_reviews_single_query(db: Session = Depends(get_read_db)):
+    """Get all societies with ratings using a single query"""
+    return get_societies_with_reviews(db)
+
+
+# Best rated societies, answered from the in-memory leaderboard
+@router.get("/top", response_model=List[RankedSociety], dependencies=[query_budget(1)])
+def get_top_societies(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_read_db)):
+    """Societies ranked by Bayesian average rating, so a handful of reviews can't top the list"""
+    return leaderboards[Society].top(db, limit)
 
 
 # Generic routes AFTER specific routes
@@ -136,6 +100,7 @@ def update_society(id: int, society_update: SocietyUpdate, db: Session = Depends
         db_society.image_url = society_update.image_url
         
     db.commit()
+    leaderboards[Society].invalidate()
     db.refresh(db_society)
     return db_society
 
@@ -147,6 +112,7 @@ def delete_society(id: int, db: Session = Depends(get_db), current_user: User =
     
     db.delete(db_society)
     db.commit()
+    leaderboards[Society].invalidate()
     return None
 
 # --- Review Endpoints ---
@@ -154,28 +120,28 @@ def delete_society(id: int, db: Session = Depends(get_db), current_user: User =
 @router.post("/reviews", response_model=SocietyReviewResponse, status_code=status.HTTP_201_CREATED)
 def create_review(
     review: SocietyReviewCreate, 
+    response: Response,
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_user)
 ):
-    # Check if society exists
-    society = db.query(Society).filter(Society.id == review.society_id).first()
-    if not society:
+    # One review per user and society: submitting again replaces the earlier one
+    result = upsert_review(db, Society, review.society_id, current_user.id, review.rating, review.comment)
+    if result is None:
         raise HTTPException(status_code=404, detail="Society not found")
-
-    db_review = SocietyReview(
-        rating=review.rating,
-        comment=review.comment,
-        user_id=current_user.id,
-        society_id=review.society_id
-    )
-    db.add(db_review)
     db.commit()
-    db.refresh(db_review)
-    return db_review
 
-@router.get("/reviews/{society_id}", response_model=List[SocietyReviewResponse])
-def get_society_reviews(society_id: int, db: Session = Depends(get_db)):
-    return db.query(SocietyReview).filter(SocietyReview.society_id == society_id).all()
+    row, created, totals = result
+    leaderboards[Society].update(review.society_id, *totals)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return {**row._mapping, "creator": current_user}
+
+# One page of reviews, newest first or with ?sort=rating, reviewers joined in the same query
+@router.get("/reviews/{society_id}", response_model=List[SocietyReviewResponse], dependencies=[query_budget(1)])
+@router.get("/{society_id}/reviews", response_model=List[SocietyReviewResponse], dependencies=[query_budget(1)])
+def get_society_reviews(society_id: int, db: Session = Depends(get_read_db), page: ReviewPaginator = Depends()):
+    query = db.query(SocietyReview).options(joinedload(SocietyReview.creator)).filter(SocietyReview.society_id == society_id)
+    return page.finish(page.apply(query, SocietyReview).all())
 
 @router.delete("/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_society_review(
@@ -191,6 +157,8 @@ def delete_society_review(
     if review.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this review")
     
-    db.delete(review)
+    totals = remove_review(db, Society, review)
     db.commit()
+    if totals is not None:
+        leaderboards[Society].update(review.society_id, *totals)
     return
\ No newline at end of file
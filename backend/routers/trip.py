@@ -1,14 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
 from models.trip import Trip, TripImage
 from models.user import User
 from schemas.trip import TripCreate, TripResponse, TripUpdate
 from database import get_db
 from authorization.oauth2 import get_current_user
+from pagination import Paginator
+from query_budget import query_budget
 
 router = APIRouter(prefix="/trips", tags=["trips"])
 
+
+# Query parameters for the trip list endpoint
+class TripFilters:
+    def __init__(
+        self,
+        destination: Optional[str] = None,
+        start_from: Optional[date] = None,
+        start_to: Optional[date] = None,
+        max_cost: Optional[float] = Query(None, ge=0),
+    ):
+        self.destination = destination
+        self.start_from = start_from
+        self.start_to = start_to
+        self.max_cost = max_cost
+
+    def apply(self, query):
+        if self.destination is not None:
+            query = query.filter(Trip.destination == self.destination)
+        if self.start_from is not None:
+            query = query.filter(Trip.start_date >= self.start_from)
+        if self.start_to is not None:
+            query = query.filter(Trip.start_date <= self.start_to)
+        if self.max_cost is not None:
+            query = query.filter(Trip.cost_per_person <= self.max_cost)
+        return query
+
 # Create a Trip
 @router.post("/", response_model=TripResponse, status_code=status.HTTP_201_CREATED)
 def create_trip(
@@ -49,30 +78,29 @@ def create_trip(
     return db_trip
 
 # Get all trips
-@router.get("/", response_model=List[TripResponse])
+@router.get("/", response_model=List[TripResponse], dependencies=[query_budget(2)])
 def get_all_trips(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    filters: TripFilters = Depends(),
+    page: Paginator = Depends()
 ):
-    trips = db.query(Trip).offset(skip).limit(limit).all()
+    trips = page.finish(page.apply(filters.apply(db.query(Trip).options(selectinload(Trip.images), joinedload(Trip.creator))), Trip).all())
     return trips
 
 # Get current user's trips
-@router.get("/me", response_model=List[TripResponse])
+@router.get("/me", response_model=List[TripResponse], dependencies=[query_budget(3)])
 def get_my_trips(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    page: Paginator = Depends()
 ):
-    trips = db.query(Trip).filter(Trip.creator_id == current_user.id).offset(skip).limit(limit).all()
+    trips = page.finish(page.apply(db.query(Trip).options(selectinload(Trip.images), joinedload(Trip.creator)).filter(Trip.creator_id == current_user.id), Trip).all())
     return trips
 
 # Get a single trip by ID
-@router.get("/{trip_id}", response_model=TripResponse)
+@router.get("/{trip_id}", response_model=TripResponse, dependencies=[query_budget(2)])
 def get_trip(trip_id: int, db: Session = Depends(get_db)):
-    trip = db.query(Trip).filter(Trip.id == trip_id).first()
+    trip = db.query(Trip).options(selectinload(Trip.images), joinedload(Trip.creator)).filter(Trip.id == trip_id).first()
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
     return trip
@@ -115,18 +143,12 @@ def update_trip(
     if trip.contact_number is not None:
         db_trip.contact_number = trip.contact_number
     
-    # Update images - delete old ones and add new ones
+    # Update images - replacing the collection deletes the old ones (delete-orphan)
     if trip.image_paths is not None:
-        # Delete existing images
-        db.query(TripImage).filter(TripImage.trip_id == trip_id).delete()
-        
-        # Add new images
-        for image_path in trip.image_paths:
-            db_image = TripImage(
-                image_path=image_path,
-                trip_id=db_trip.id
-            )
-            db.add(db_image)
+        db_trip.images = [
+            TripImage(image_path=image_path)
+            for image_path in trip.image_paths
+        ]
     
     db.commit()
     db.refresh(db_trip)
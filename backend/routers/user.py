@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends
+import os
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User
 from schemas.user import UserCreate, UserResponse, UserUpdate
-from database import get_db
-from hashing import Hash
-from authorization.oauth2 import get_current_user
+from database import get_db, get_async_db
+from hashing import hash_password
+from rate_limit import TokenBuckets, client_ip
+from authorization.oauth2 import get_current_user, forget_user
 from authorization.auth_token import create_access_token
 from datetime import timedelta
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Behind a proxy, client IPs need FORWARDED_ALLOW_IPS (see rate_limit.py)
+signup_ip_limits = TokenBuckets(
+    "signup_ip",
+    burst=int(os.getenv("SIGNUP_IP_BURST", "5")),
+    rate=float(os.getenv("SIGNUP_IP_PER_MINUTE", "1")) / 60,
+)
+
 @router.post("/")
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    hashed_password = Hash.bcrypt(user.password)
+async def create_user(request: Request, user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    signup_ip_limits.limit(client_ip(request))
+    hashed_password = await hash_password(user.password)
     
     db_user = User(
         username=user.username,
@@ -22,8 +33,8 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Generate JWT token
     access_token = create_access_token(data={"sub": db_user.email})
@@ -55,5 +66,6 @@ def update_me(
     current_user.department = user_update.department
     
     db.commit()
+    forget_user(current_user.email)
     db.refresh(current_user)
     return current_user
\ No newline at end of file
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
+from datetime import datetime
+from schemas.user import CreatorResponse
 
 class ReviewBase(BaseModel):
     rating: float = Field(..., ge=0, le=5, description="Rating between 0 and 5")
@@ -12,6 +14,8 @@ class ReviewRead(ReviewBase):
     id: int
     user_id: int
     cafe_id: int
+    created_at: Optional[datetime] = None
+    creator: Optional[CreatorResponse] = None
 
     class Config:
         from_attributes = True
@@ -30,8 +34,21 @@ class CafeRead(CafeBase):
     class Config:
         from_attributes = True
 
+# Leaderboard entry; score is the Bayesian average used for ranking
+class RankedCafe(BaseModel):
+    id: int
+    name: str
+    image_url: Optional[str] = None
+    average_rating: float
+    review_count: int
+    score: float
+
+# Cafe summary with the first page of its reviews; next_cursor continues at /cafes/{id}/reviews
 class CafeWithReviews(CafeRead):
+    average_rating: float = 0.0
+    review_count: int = 0
     reviews: List[ReviewRead] = []
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import date, datetime
 from schemas.user import CreatorResponse
 
@@ -37,4 +37,15 @@ class LostFoundItemResponse(BaseModel):
     creator: CreatorResponse
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class LostFoundMatchResponse(BaseModel):
+    score: float
+    item: LostFoundItemResponse
+
+
+class LostFoundFacets(BaseModel):
+    category: Dict[str, int]
+    type: Dict[str, int]
+    status: Dict[str, int]
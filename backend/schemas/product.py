@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from schemas.user import CreatorResponse
 
@@ -61,4 +61,10 @@ class ProductResponse(BaseModel):
     creator: CreatorResponse
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Schema for product facet counts (value -> number of matching products)
+class ProductFacets(BaseModel):
+    category: Dict[str, int]
+    condition: Dict[str, int]
@@ -33,9 +33,14 @@ class RequesterResponse(BaseModel):
 class RideResponse(RideCreate):
     id: int
     requester_id: int
+    departure_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     requester: Optional[RequesterResponse] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RideMatch(RideResponse):
+    minutes_apart: float    # Distance from the requested departure time
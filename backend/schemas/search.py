@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class SearchResult(BaseModel):
+    id: int
+    type: str
+    title: str
+    snippet: str             # HTML-escaped description excerpt with the matched terms wrapped in <mark>
+    rank: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
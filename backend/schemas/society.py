@@ -40,6 +40,7 @@ class SocietyReviewResponse(BaseModel):
     comment: str
     user_id: int
     society_id: int
+    created_at: Optional[datetime] = None
     creator: ReviewCreatorResponse
 
     class Config:
@@ -74,4 +75,14 @@ class SocietyReviewUpdate(BaseModel):
     comment: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Leaderboard entry; score is the Bayesian average used for ranking
+class RankedSociety(BaseModel):
+    id: int
+    name: str
+    image_url: Optional[str] = None
+    average_rating: float
+    review_count: int
+    score: float
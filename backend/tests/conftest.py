@@ -0,0 +1,66 @@
+"""Tests run against DATABASE_URL, an in-memory SQLite database unless it is set.
+Tests marked postgres_only are skipped on anything else:
+
+    cd backend && python -m pytest tests
+    DATABASE_URL=postgresql+psycopg2://localhost/nustmarkaz_test python -m pytest tests
+
+A Postgres database is used as found: missing tables are created, existing
+rows are left alone, and the tests add rows with unique names.
+"""
+from pathlib import Path
+import os
+import sys
+import uuid
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Settings are read at import, so they go in before the app is imported
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ["QUERY_BUDGET_MODE"] = "enforce"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import make_url  # noqa: E402
+
+import database  # noqa: E402
+from authorization.auth_token import create_access_token  # noqa: E402
+from models.user import User  # noqa: E402
+
+ON_POSTGRES = make_url(database.DATABASE_URL).get_backend_name() == "postgresql"
+
+postgres_only = pytest.mark.skipif(not ON_POSTGRES, reason="needs a Postgres DATABASE_URL")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    import main  # noqa: F401  Imports every model
+    database.Base.metadata.create_all(bind=database.get_engine())
+
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    with database.SessionLocal() as db:
+        yield db
+
+
+@pytest.fixture
+def user(db):
+    name = f"test-{uuid.uuid4().hex[:12]}"
+    user = User(username=name, email=f"{name}@example.com", department="SEECS", password="not-a-hash")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
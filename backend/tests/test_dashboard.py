@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.product import Product, ProductImage
+from models.ride import Ride
+
+
+@pytest.fixture
+def posts(db, user):
+    for n in range(3):
+        db.add(Product(title=f"Desk lamp {n}", description="Works", price=500, category="electronics",
+                       pickup_location="H12", condition="used", contact_number="0300", creator_id=user.id,
+                       created_at=datetime.utcnow() - timedelta(minutes=n),
+                       images=[ProductImage(image_path=f"uploads/products/lamp{n}.jpg")]))
+        db.add(Ride(from_location="H12", to_location="Blue Area", ride_date="2026-05-01", ride_time="09:00",
+                    contact="0300", requester_id=user.id, created_at=datetime.utcnow() - timedelta(minutes=n)))
+    db.commit()
+
+
+@pytest.mark.parametrize("query", ["", "?limit=2", "?type=product&type=ride"])
+def test_latest_is_one_statement(client, posts, query):
+    response = client.get(f"/dashboard/latest{query}")
+    assert response.status_code == 200, response.text
+    assert response.json()
+    assert response.headers["x-query-count"] == "1"
+
+
+def test_next_page_is_one_statement(client, posts):
+    first = client.get("/dashboard/latest?limit=2")
+    response = client.get(first.links["next"]["url"])
+    assert response.status_code == 200, response.text
+    assert response.headers["x-query-count"] == "1"
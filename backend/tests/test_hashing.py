@@ -0,0 +1,42 @@
+import asyncio
+
+import hashing
+from hashing import Hash, HashPool, HashPoolBusy
+
+
+def test_rejects_instead_of_queueing_past_the_limit():
+    pool = HashPool(workers=1, queue_limit=2)
+
+    async def burst():
+        return await asyncio.gather(*(pool.run(Hash.bcrypt, "pw", 4) for _ in range(4)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(burst())
+    finally:
+        pool.shutdown()
+    assert [isinstance(result, HashPoolBusy) for result in results] == [False, False, True, True]
+    assert pool.stats()["rejected"] == 2
+
+
+def test_replaces_a_broken_pool():
+    pool = HashPool(workers=1, queue_limit=4)
+
+    async def kill_worker_then_verify():
+        hashed = await pool.run(Hash.bcrypt, "pw", 4)
+        for process in list(pool._executor._processes.values()):
+            process.kill()
+            process.join()
+        return await pool.run(Hash.verify, "pw", hashed)
+
+    try:
+        assert asyncio.run(kill_worker_then_verify())
+    finally:
+        pool.shutdown()
+
+
+def test_rehashes_only_up_to_the_current_cost(monkeypatch):
+    monkeypatch.setattr(hashing, "_rounds", 5)
+
+    assert Hash.needs_rehash(Hash.bcrypt("pw", 4))
+    assert not Hash.needs_rehash(Hash.bcrypt("pw", 5))
+    assert not Hash.needs_rehash(Hash.bcrypt("pw", 6))
@@ -0,0 +1,26 @@
+from datetime import date
+import uuid
+
+import matching
+from models.lost_found import LostFoundItem, ItemType, ItemStatus, ContactMethod
+
+
+def item(db, type_, day, category):
+    row = LostFoundItem(
+        title="Black wallet", category=category, location="C1", date=date(2026, 3, day),
+        description="Leather wallet", contact_method=ContactMethod.email, contact_info="a@example.com",
+        type=type_, status=ItemStatus.LOST if type_ == ItemType.lost else ItemStatus.FOUND,
+    )
+    db.add(row)
+    db.flush()
+    return row
+
+
+def test_candidates_are_the_closest_in_date(db, monkeypatch):
+    monkeypatch.setattr(matching, "MATCH_CANDIDATES", 3)
+    category = f"wallets-{uuid.uuid4().hex[:8]}"
+    lost = item(db, ItemType.lost, 15, category)
+    found = {day: item(db, ItemType.found, day, category) for day in (2, 5, 13, 14, 17, 28)}
+
+    assert {c.id for c in matching.candidates(db, lost)} == {found[13].id, found[14].id, found[17].id}
+    db.rollback()
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+import pytest
+
+from models.donation import Donation
+
+
+@pytest.mark.parametrize("url", ["/products/", "/donations/", "/rides/"])
+def test_skip_is_rejected(client, url):
+    assert client.get(url, params={"skip": 10}).status_code == 400
+    assert client.get(url, params={"skip": 0}).status_code == 200
+
+
+def test_donations_default_to_pages_of_ten(client, db, user):
+    db.add_all(
+        Donation(title=f"Books {n}", description="For the library", beneficiary="Library", goal_amount=1000,
+                 end_date=date.today() + timedelta(days=30), creator_id=user.id)
+        for n in range(11)
+    )
+    db.commit()
+
+    first = client.get("/donations/")
+    assert len(first.json()) == 10
+    second = client.get(first.links["next"]["url"])
+    assert second.status_code == 200
+    assert {d["id"] for d in first.json()}.isdisjoint(d["id"] for d in second.json())
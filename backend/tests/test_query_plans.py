@@ -0,0 +1,110 @@
+"""EXPLAIN every statement the indexed read paths run and fail on a Seq Scan.
+
+The statements are captured while the endpoints serve real requests, then
+replayed on the same engine with enable_seqscan off: Postgres still picks a
+sequential scan when no index can serve the query, which is what this catches
+on tables too small for the planner to prefer an index on its own.
+"""
+import asyncio
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from models.donation import Donation, DonationImage
+from models.event import Event, EventImage
+from models.lost_found import LostFoundItem, ItemType, ItemStatus, ContactMethod
+from models.product import Product, ProductImage
+from models.ride import Ride
+from models.trip import Trip, TripImage
+
+from conftest import postgres_only
+
+pytestmark = postgres_only
+
+
+@contextmanager
+def captured():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((conn.engine, statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def explain(engine, statement, parameters) -> str:
+    if engine.dialect.is_async:
+        async def run():
+            async with AsyncEngine(engine).connect() as conn:
+                await conn.exec_driver_sql("SET enable_seqscan = off")
+                return (await conn.exec_driver_sql("EXPLAIN " + statement, parameters)).scalars().all()
+        lines = asyncio.run(run())
+    else:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            lines = conn.exec_driver_sql("EXPLAIN " + statement, parameters).scalars().all()
+    return "\n".join(lines)
+
+
+def assert_indexed(client, url, headers=None):
+    with captured() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    assert statements
+    for engine, statement, parameters in statements:
+        plan = explain(engine, statement, parameters)
+        assert "Seq Scan" not in plan, f"{url}\n{statement}\n{plan}"
+
+
+@pytest.fixture
+def posts(db, user):
+    now = datetime.utcnow()
+    db.add_all([
+        Product(title="Desk lamp", description="Works", price=500, category="electronics",
+                pickup_location="H12", condition="used", contact_number="0300", creator_id=user.id,
+                images=[ProductImage(image_path="uploads/products/lamp.jpg")]),
+        Trip(title="Naran", description="Weekend", destination="Naran", start_date=date.today(),
+             end_date=date.today() + timedelta(days=2), departure_location="Gate 1",
+             cost_per_person=9000, contact_number="0300", creator_id=user.id,
+             images=[TripImage(image_path="uploads/trips/naran.jpg")]),
+        Event(title="Hackathon", description="24h", society="ACM", location="SEECS",
+              event_date=now + timedelta(days=7), creator_id=user.id,
+              images=[EventImage(image_path="uploads/events/hack.jpg")]),
+        Donation(title="Books", description="For the library", beneficiary="Library", goal_amount=10000,
+                 end_date=date.today() + timedelta(days=30), creator_id=user.id,
+                 images=[DonationImage(image_path="uploads/donations/books.jpg")]),
+        LostFoundItem(title="Black wallet", category="wallets", location="C1", date=date.today(),
+                      description="Leather", image_path="uploads/lost_found/wallet.jpg",
+                      contact_method=ContactMethod.email, contact_info="a@example.com",
+                      type=ItemType.lost, status=ItemStatus.LOST, creator_id=user.id),
+        Ride(from_location="H12", to_location="Blue Area", ride_date="2026-05-01", ride_time="09:00",
+             contact="0300", requester_id=user.id),
+    ])
+    db.commit()
+
+
+@pytest.mark.parametrize("url", ["/dashboard/latest", "/dashboard/latest?type=product&type=event"])
+def test_dashboard(client, posts, url):
+    assert_indexed(client, url)
+
+
+@pytest.mark.parametrize("path", ["products", "trips", "events", "donations", "lost-found", "rides"])
+def test_my_posts(client, auth, posts, path):
+    assert_indexed(client, f"/{path}/me", auth)
+
+
+def test_trips_by_destination(client, posts):
+    assert_indexed(client, "/trips/?destination=Naran")
+
+
+def test_profile(client, auth, posts):
+    assert_indexed(client, "/users/me/profile/", auth)
@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+import threading
+import uuid
+
+from sqlalchemy import event
+
+from database import SessionLocal
+from models.cafe import Cafe, Review
+from ratings import remove_review, upsert_review
+
+from conftest import ON_POSTGRES, postgres_only
+
+
+def new_cafe(db) -> int:
+    cafe = Cafe(name=f"Cafe {uuid.uuid4().hex[:8]}")
+    db.add(cafe)
+    db.commit()
+    return cafe.id
+
+
+def totals(db, cafe_id: int):
+    db.expire_all()
+    cafe = db.get(Cafe, cafe_id)
+    return cafe.rating_sum, cafe.review_count
+
+
+def test_editing_a_review_replaces_its_rating(db, user):
+    cafe_id = new_cafe(db)
+
+    _, created, _ = upsert_review(db, Cafe, cafe_id, user.id, 4, "good")
+    db.commit()
+    assert created
+    _, created, result = upsert_review(db, Cafe, cafe_id, user.id, 2, "worse")
+    db.commit()
+
+    assert not created
+    assert tuple(result) == (2, 1)
+    assert totals(db, cafe_id) == (2, 1)
+
+
+@contextmanager
+def statements(db):
+    executed = []
+    engine = db.get_bind()
+    record = lambda *args: executed.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_upsert_round_trips(db, user):
+    cafe_id, user_id = new_cafe(db), user.id
+
+    # The lock, then one statement on Postgres; read, upsert, adjust elsewhere
+    for rating in (4, 2):
+        with statements(db) as executed:
+            upsert_review(db, Cafe, cafe_id, user_id, rating, "good")
+        db.commit()
+        assert len(executed) == (2 if ON_POSTGRES else 3)
+
+
+def test_deleting_a_review_takes_out_its_current_rating(db, user):
+    cafe_id = new_cafe(db)
+    upsert_review(db, Cafe, cafe_id, user.id, 4, "good")
+    db.commit()
+    review = db.query(Review).filter(Review.cafe_id == cafe_id).one()
+
+    with SessionLocal() as other:
+        # Edited after the delete request loaded it
+        upsert_review(other, Cafe, cafe_id, user.id, 1, "worse")
+        other.commit()
+        stale = other.get(Review, review.id)
+
+        assert tuple(remove_review(db, Cafe, review)) == (0, 0)
+        db.commit()
+        # And deleted again by a request that loaded it before the first delete
+        assert remove_review(other, Cafe, stale) is None
+        other.commit()
+
+    assert totals(db, cafe_id) == (0, 0)
+
+
+def test_missing_cafe(db, user):
+    assert upsert_review(db, Cafe, 10**9, user.id, 4, "good") is None
+
+
+@postgres_only
+def test_concurrent_first_reviews_by_one_user_count_once(db, user):
+    cafe_id = new_cafe(db)
+
+    # The first submit holds the cafe row lock until it commits; the second
+    # must wait for it and then edit the review instead of adding another
+    with SessionLocal() as first:
+        upsert_review(first, Cafe, cafe_id, user.id, 5, "first")
+        second_done = threading.Event()
+
+        def second_submit():
+            with SessionLocal() as second:
+                upsert_review(second, Cafe, cafe_id, user.id, 3, "second")
+                second.commit()
+            second_done.set()
+
+        thread = threading.Thread(target=second_submit)
+        thread.start()
+        assert not second_done.wait(0.5), "second submit didn't wait for the cafe row lock"
+        first.commit()
+        thread.join(10)
+
+    assert second_done.is_set()
+    assert totals(db, cafe_id) == (3, 1)
+
+
+def test_review_endpoints_keep_the_aggregates(client, db, auth):
+    cafe_id = new_cafe(db)
+
+    created = client.post(f"/cafes/{cafe_id}/reviews", json={"rating": 4, "comment": "good"}, headers=auth)
+    assert created.status_code == 201, created.text
+    deleted = client.delete(f"/cafes/{cafe_id}/reviews/{created.json()['id']}", headers=auth)
+    assert deleted.status_code == 204, deleted.text
+
+    assert totals(db, cafe_id) == (0, 0)
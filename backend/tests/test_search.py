@@ -0,0 +1,39 @@
+import re
+import uuid
+
+from models.product import Product
+
+from conftest import postgres_only
+
+
+def post(db, user, description):
+    word = f"lamp{uuid.uuid4().hex[:8]}"
+    db.add(Product(title=f"Desk {word}", description=description.format(word=word), price=500, category="electronics",
+                   pickup_location="H12", condition="used", contact_number="0300", creator_id=user.id))
+    db.commit()
+    return word
+
+
+def snippet(client, word):
+    response = client.get("/search/", params={"q": word, "type": "product"})
+    assert response.status_code == 200, response.text
+    [result] = response.json()
+    return result["snippet"]
+
+
+def test_snippet_escapes_the_description(client, db, user):
+    word = post(db, user, "<img src=x onerror=alert(1)> {word} & \"more\"")
+
+    text = snippet(client, word)
+    assert "<img" not in text
+    assert "&lt;img src=x onerror=alert(1)&gt;" in text
+    assert "&amp; &quot;more&quot;" in text
+
+
+@postgres_only
+def test_headline_marks_are_the_only_tags(client, db, user):
+    word = post(db, user, "<b>Bright</b> {word} for reading, <script>alert(1)</script>")
+
+    text = snippet(client, word)
+    assert re.findall(r"<[^>]*>", text) == ["<mark>", "</mark>"]
+    assert f"<mark>{word}</mark>" in text
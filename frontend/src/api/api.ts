@@ -26,4 +26,18 @@ api.interceptors.request.use(
   }
 );
 
-export default api;
\ No newline at end of file
+export default api;
+// One page of a cursor paginated list; pass nextCursor back to get the next one
+export interface Page<T> {
+  items: T[];
+  nextCursor?: string;
+}
+
+// List endpoints link the next page in a `Link: <url>; rel="next"` header
+export const nextCursor = (link?: string): string | undefined => {
+  const match = link?.match(/<([^>]*)>;\s*rel="next"/);
+  if (!match) {
+    return undefined;
+  }
+  return new URL(match[1]).searchParams.get('cursor') ?? undefined;
+};
@@ -1,4 +1,4 @@
-import api from "./api";
+import api, { nextCursor, Page } from "./api";
 
 export interface Creator {
   id: number;
@@ -50,12 +50,12 @@ export interface DonationUpdateRequest {
 
 // Get all donations
 export const getAllDonations = async (
-  skip: number = 0,
   limit: number = 100,
+  cursor?: string,
 ): Promise<Donation[]> => {
   try {
     const response = await api.get<Donation[]>("/donations/", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
     return response.data;
   } catch (error) {
@@ -66,14 +66,14 @@ export const getAllDonations = async (
 
 // Get current user's donations
 export const getMyDonations = async (
-  skip: number = 0,
+  cursor?: string,
   limit: number = 10,
-): Promise<Donation[]> => {
+): Promise<Page<Donation>> => {
   try {
     const response = await api.get<Donation[]>("/donations/me", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
-    return response.data;
+    return { items: response.data, nextCursor: nextCursor(response.headers.link) };
   } catch (error) {
     console.error("Failed to fetch my donations:", error);
     throw error;
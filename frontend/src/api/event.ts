@@ -1,4 +1,4 @@
-import api from './api';
+import api, { nextCursor, Page } from './api';
 
 export interface EventImage {
   id: number;
@@ -62,14 +62,14 @@ export const getAllEvents = async (): Promise<Event[]> => {
 
 // Get current user's events
 export const getMyEvents = async (
-  skip: number = 0,
+  cursor?: string,
   limit: number = 10,
-): Promise<Event[]> => {
+): Promise<Page<Event>> => {
   try {
     const response = await api.get<Event[]>("/events/me", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
-    return response.data;
+    return { items: response.data, nextCursor: nextCursor(response.headers.link) };
   } catch (error) {
     console.error("Failed to fetch my events:", error);
     throw error;
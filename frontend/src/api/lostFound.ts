@@ -1,4 +1,4 @@
-import api from './api';
+import api, { nextCursor, Page } from './api';
 
 export interface Creator {
   id: number;
@@ -47,14 +47,14 @@ export const getAllLostFoundItems = async (): Promise<LostFoundItem[]> => {
 
 // Get current user's lost and found items
 export const getMyLostFoundItems = async (
-  skip: number = 0,
+  cursor?: string,
   limit: number = 10,
-): Promise<LostFoundItem[]> => {
+): Promise<Page<LostFoundItem>> => {
   try {
     const response = await api.get<LostFoundItem[]>("/lost-found/me", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
-    return response.data;
+    return { items: response.data, nextCursor: nextCursor(response.headers.link) };
   } catch (error) {
     console.error("Failed to fetch my lost and found items:", error);
     throw error;
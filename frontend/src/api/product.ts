@@ -1,4 +1,4 @@
-import api from "./api";
+import api, { nextCursor, Page } from "./api";
 
 export interface ProductImage {
   id: number;
@@ -40,12 +40,12 @@ export interface ProductCreateRequest {
 
 // Get all products with pagination
 export const getAllProducts = async (
-  skip: number = 0,
   limit: number = 100,
+  cursor?: string,
 ): Promise<Product[]> => {
   try {
     const response = await api.get<Product[]>("/products/", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
     return response.data;
   } catch (error) {
@@ -56,14 +56,14 @@ export const getAllProducts = async (
 
 // Get current user's products
 export const getMyProducts = async (
-  skip: number = 0,
+  cursor?: string,
   limit: number = 10,
-): Promise<Product[]> => {
+): Promise<Page<Product>> => {
   try {
     const response = await api.get<Product[]>("/products/me", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
-    return response.data;
+    return { items: response.data, nextCursor: nextCursor(response.headers.link) };
   } catch (error) {
     console.error("Failed to fetch my products:", error);
     throw error;
@@ -1,4 +1,4 @@
-import api from "./api";
+import api, { nextCursor, Page } from "./api";
 
 export interface Requester {
   id: number;
@@ -29,12 +29,12 @@ export interface RideCreateRequest {
 
 // Get all ride requests with pagination
 export const getAllRides = async (
-  skip: number = 0,
   limit: number = 100,
+  cursor?: string,
 ): Promise<Ride[]> => {
   try {
     const response = await api.get<Ride[]>("/rides/", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
     return response.data;
   } catch (error) {
@@ -45,14 +45,14 @@ export const getAllRides = async (
 
 // Get current user's ride requests
 export const getMyRides = async (
-  skip: number = 0,
+  cursor?: string,
   limit: number = 10,
-): Promise<Ride[]> => {
+): Promise<Page<Ride>> => {
   try {
     const response = await api.get<Ride[]>("/rides/me", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
-    return response.data;
+    return { items: response.data, nextCursor: nextCursor(response.headers.link) };
   } catch (error) {
     console.error("Failed to fetch my ride requests:", error);
     throw error;
@@ -1,4 +1,4 @@
-import api from "./api";
+import api, { nextCursor, Page } from "./api";
 
 export interface TripImage {
   id: number;
@@ -44,12 +44,12 @@ export interface TripCreateRequest {
 
 // Get all trips
 export const getAllTrips = async (
-  skip: number = 0,
   limit: number = 100,
+  cursor?: string,
 ): Promise<Trip[]> => {
   try {
     const response = await api.get<Trip[]>("/trips/", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
     return response.data;
   } catch (error) {
@@ -60,14 +60,14 @@ export const getAllTrips = async (
 
 // Get current user's trips
 export const getMyTrips = async (
-  skip: number = 0,
+  cursor?: string,
   limit: number = 10,
-): Promise<Trip[]> => {
+): Promise<Page<Trip>> => {
   try {
     const response = await api.get<Trip[]>("/trips/me", {
-      params: { skip, limit },
+      params: { limit, cursor },
     });
-    return response.data;
+    return { items: response.data, nextCursor: nextCursor(response.headers.link) };
   } catch (error) {
     console.error("Failed to fetch my trips:", error);
     throw error;
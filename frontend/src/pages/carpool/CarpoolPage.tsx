@@ -41,7 +41,7 @@ export default function CarpoolPage() {
   const fetchData = async () => {
     setIsLoading(true);
     try {
-      const ridesData = await getAllRides(0, 50);
+      const ridesData = await getAllRides(50);
       setRides(ridesData);
     } catch (error) {
       toast.error("Failed to load ride requests.");
@@ -53,7 +53,7 @@ export default function CarpoolPage() {
 
   const fetchRides = async () => {
     try {
-      const data = await getAllRides(0, 50);
+      const data = await getAllRides(50);
       setRides(data);
     } catch (error) {
       toast.error("Failed to load ride requests.");
@@ -25,7 +25,7 @@ export default function DonationsPage() {
     try {
       setLoading(true);
       setError(null);
-      const data = await getAllDonations(0, 100);
+      const data = await getAllDonations(100);
       setDonations(data);
     } catch (err) {
       console.error("Error fetching donations:", err);
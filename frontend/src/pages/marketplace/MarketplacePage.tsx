@@ -44,7 +44,7 @@ export default function MarketplacePage() {
     try {
       setLoading(true);
       setError(null);
-      const data = await getAllProducts(0, 100); // Fetch up to 100 products
+      const data = await getAllProducts(100); // Fetch up to 100 products
       setProducts(data);
     } catch (err) {
       console.error("Error fetching products:", err);
@@ -32,6 +32,7 @@ import { getMyRides } from "@/api/ride";
 import { getMyDonations } from "@/api/donation";
 import { getMyEvents } from "@/api/event";
 import { getMyLostFoundItems } from "@/api/lostFound";
+import type { Page } from "@/api/api";
 import { Skeleton } from "@/components/ui/skeleton";
 
 export default function ProfilePage() {
@@ -355,11 +356,9 @@ function TabContent({
     error
   } = useInfiniteQuery({
     queryKey: [queryKey],
-    queryFn: ({ pageParam = 0 }) => fetchFn(pageParam, 10),
-    getNextPageParam: (lastPage, allPages) => {
-      return lastPage.length === 10 ? allPages.length * 10 : undefined;
-    },
-    initialPageParam: 0,
+    queryFn: ({ pageParam }) => fetchFn(pageParam, 10),
+    getNextPageParam: (lastPage: Page<unknown>) => lastPage.nextCursor,
+    initialPageParam: undefined as string | undefined,
   });
 
   if (isLoading) {
@@ -371,7 +370,7 @@ function TabContent({
     );
   }
 
-  const allItems = data?.pages.flat() || [];
+  const allItems = data?.pages.flatMap((page) => page.items) || [];
 
   if (allItems.length === 0) {
     return (